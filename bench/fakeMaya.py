@@ -0,0 +1,710 @@
+import fnmatch
+import sys
+import threading
+import time
+import types
+from collections import OrderedDict
+
+
+Clock = getattr(time, "perf_counter", time.time)
+
+
+def Spin(seconds):
+    if seconds <= 0:
+        return
+
+    end = Clock() + seconds
+    while Clock() < end:
+        pass
+
+
+class NodeType(object):
+    def __init__(self, name, bases, attrs):
+        self.name = name
+        self.bases = bases
+        self.attrs = attrs
+
+
+NodeTypes = OrderedDict()
+NodeTypes["dagNode"] = NodeType("dagNode", [], [])
+NodeTypes["transform"] = NodeType("transform", ["dagNode"], [
+    ("translateX", "tx", "doubleLinear", 0.0, True), ("translateY", "ty", "doubleLinear", 0.0, True), ("translateZ", "tz", "doubleLinear", 0.0, True),
+    ("rotateX", "rx", "doubleAngle", 0.0, True), ("rotateY", "ry", "doubleAngle", 0.0, True), ("rotateZ", "rz", "doubleAngle", 0.0, True),
+    ("scaleX", "sx", "double", 1.0, True), ("scaleY", "sy", "double", 1.0, True), ("scaleZ", "sz", "double", 1.0, True),
+    ("visibility", "v", "bool", True, True)])
+NodeTypes["joint"] = NodeType("joint", ["transform", "dagNode"], NodeTypes["transform"].attrs + [("radius", "radi", "double", 1.0, False)])
+NodeTypes["mesh"] = NodeType("mesh", ["dagNode"], [("intermediateObject", "io", "bool", False, False), ("displayColors", "dcol", "bool", False, False)])
+NodeTypes["multiplyDivide"] = NodeType("multiplyDivide", [], [
+    ("operation", "op", "enum", 1, True),
+    ("input1X", "i1x", "float", 0.0, True), ("input1Y", "i1y", "float", 0.0, True), ("input1Z", "i1z", "float", 0.0, True),
+    ("input2X", "i2x", "float", 1.0, True), ("input2Y", "i2y", "float", 1.0, True), ("input2Z", "i2z", "float", 1.0, True),
+    ("outputX", "ox", "float", 0.0, False), ("outputY", "oy", "float", 0.0, False), ("outputZ", "oz", "float", 0.0, False)])
+NodeTypes["network"] = NodeType("network", [], [("binMembership", "bnm", "string", "", False)])
+
+DynamicAttrs = [("userValue", "uv", "double", 0.0, True), ("userTag", "ut", "string", "", False)]
+
+
+class Node(object):
+    def __init__(self, name, typeName, parent=None):
+        self.name = name
+        self.type = typeName
+        self.parent = parent
+        self.children = []
+        self.attrs = OrderedDict()
+        self.short = {}
+
+        for long_name, short_name, attr_type, value, keyable in NodeTypes[typeName].attrs:
+            self.addAttr(long_name, short_name, attr_type, value, keyable, False)
+
+    def addAttr(self, longName, shortName, attrType, value, keyable, dynamic):
+        self.attrs[longName] = [attrType, value, keyable, dynamic]
+        self.short[shortName] = longName
+
+
+class Scene(object):
+    def __init__(self):
+        self.nodes = OrderedDict()
+        self.sources = {}
+        self.destinations = {}
+        self.path = ""
+        self.modified = False
+
+    @staticmethod
+    def Generate(plugs, dynamic=True):
+        scene = Scene()
+        per_node = 10 + (len(DynamicAttrs) if dynamic else 0)
+        last_transform = None
+
+        for i in range(max(1, plugs // per_node)):
+            if i % 2 == 0:
+                parent = last_transform if i % 10 else None
+                node = scene.addNode("xform{}".format(i), "transform", parent)
+                last_transform = node.name
+            else:
+                node = scene.addNode("md{}".format(i), "multiplyDivide")
+                scene.connect("{}.translateX".format(last_transform), "{}.input1X".format(node.name))
+
+            if dynamic:
+                for attr in DynamicAttrs:
+                    node.addAttr(*(attr + (True, )))
+
+        scene.modified = False
+
+        return scene
+
+    def addNode(self, name, typeName, parent=None):
+        node = Node(name, typeName, parent)
+        self.nodes[name] = node
+        if parent:
+            self.nodes[parent].children.append(name)
+
+        self.modified = True
+
+        return node
+
+    def uniqueName(self, name):
+        if name not in self.nodes:
+            return name
+
+        base = name.rstrip("0123456789")
+        i = 1
+        while "{}{}".format(base, i) in self.nodes:
+            i += 1
+
+        return "{}{}".format(base, i)
+
+    def fullPath(self, name):
+        node = self.nodes[name]
+        if node.type not in Derived("dagNode"):
+            return name
+
+        path = []
+        while name:
+            path.append(name)
+            name = self.nodes[name].parent
+
+        return "|" + "|".join(reversed(path))
+
+    def findNode(self, name):
+        node = self.nodes.get(name.rpartition("|")[2])
+        if node is None:
+            raise ValueError("No object matches name: {}".format(name))
+
+        return node
+
+    def findPlug(self, plug):
+        node_name, _, attr = plug.partition(".")
+        node = self.findNode(node_name)
+        attr = node.short.get(attr, attr)
+        if attr not in node.attrs:
+            raise ValueError("No object matches name: {}".format(plug))
+
+        return node, attr
+
+    def plugName(self, plug):
+        node, attr = self.findPlug(plug)
+
+        return "{}.{}".format(node.name, attr)
+
+    def connect(self, src, dst):
+        src = self.plugName(src)
+        dst = self.plugName(dst)
+        self.sources[dst] = src
+        self.destinations.setdefault(src, []).append(dst)
+        self.modified = True
+
+    def disconnect(self, src, dst):
+        self.destinations[src].remove(dst)
+        if not self.destinations[src]:
+            del self.destinations[src]
+
+        del self.sources[dst]
+        self.modified = True
+
+    def delete(self, name):
+        node = self.nodes.pop(name, None)
+        if node is None:
+            return
+
+        for child in list(node.children):
+            self.delete(child)
+
+        if node.parent in self.nodes:
+            self.nodes[node.parent].children.remove(name)
+
+        for attr in node.attrs:
+            plug = "{}.{}".format(name, attr)
+            if plug in self.sources:
+                self.disconnect(self.sources[plug], plug)
+
+            for dst in list(self.destinations.get(plug, [])):
+                self.disconnect(plug, dst)
+
+        self.modified = True
+
+
+def Derived(typeName):
+    return [t.name for t in NodeTypes.values() if t.name == typeName or typeName in t.bases]
+
+
+class Cmds(types.ModuleType):
+    def __init__(self):
+        super(Cmds, self).__init__("maya.cmds")
+        self.scene = Scene()
+        self.latency = 0.0
+        self.undo = True
+        self.evaluation = "parallel"
+
+    def __call(self):
+        Spin(self.latency)
+
+    def undoInfo(self, query=False, state=None, **kwargs):
+        self.__call()
+        if query:
+            return self.undo
+
+        if "stateWithoutFlush" in kwargs:
+            self.undo = kwargs["stateWithoutFlush"]
+
+        return None
+
+    def about(self, batch=False, **kwargs):
+        return True
+
+    def refresh(self, **kwargs):
+        self.__call()
+
+    def evaluationManager(self, query=False, mode=None, **kwargs):
+        self.__call()
+        if query:
+            return [self.evaluation]
+
+        self.evaluation = mode
+
+    def allNodeTypes(self, **kwargs):
+        self.__call()
+        return list(NodeTypes.keys())
+
+    def nodeType(self, name, derived=False, isTypeName=False, **kwargs):
+        self.__call()
+        if isTypeName:
+            if name not in NodeTypes:
+                raise RuntimeError("Unknown node type: {}".format(name))
+
+            return Derived(name) if derived else name
+
+        return self.scene.findNode(name.partition(".")[0]).type
+
+    def ls(self, *patterns, **kwargs):
+        self.__call()
+        allowed = None
+        if kwargs.get("type"):
+            allowed = set(Derived(kwargs["type"]))
+
+        results = []
+        for name, node in self.scene.nodes.items():
+            if allowed is not None and node.type not in allowed:
+                continue
+
+            if patterns and not any(fnmatch.fnmatchcase(name, p) for p in patterns):
+                continue
+
+            results.append(self.scene.fullPath(name) if kwargs.get("long") else name)
+
+        return results
+
+    def objExists(self, name):
+        self.__call()
+        try:
+            if "." in name:
+                self.scene.findPlug(name)
+            else:
+                self.scene.findNode(name)
+        except ValueError:
+            return False
+
+        return True
+
+    def listAttr(self, name, keyable=False, userDefined=False, shortNames=False, **kwargs):
+        self.__call()
+        node = self.scene.findNode(name)
+        short = dict((v, k) for k, v in node.short.items())
+        results = []
+
+        for attr, (attr_type, value, key, dynamic) in node.attrs.items():
+            if keyable and not key:
+                continue
+
+            if userDefined and not dynamic:
+                continue
+
+            results.append(short[attr] if shortNames else attr)
+
+        return results
+
+    def getAttr(self, plug, type=False, **kwargs):
+        self.__call()
+        node, attr = self.scene.findPlug(plug)
+        data = node.attrs[attr]
+
+        return data[0] if type else data[1]
+
+    def setAttr(self, plug, *values, **kwargs):
+        self.__call()
+        node, attr = self.scene.findPlug(plug)
+        data = node.attrs[attr]
+        name = "{}.{}".format(node.name, attr)
+
+        if name in self.scene.sources:
+            raise RuntimeError("setAttr: The attribute '{}' is locked or connected and cannot be modified.".format(plug))
+
+        if (data[0] == "string") != (kwargs.get("type") == "string"):
+            raise RuntimeError("setAttr: Error reading data element number 1: {}".format(values[0]))
+
+        data[1] = values[0]
+        self.scene.modified = True
+
+    def connectAttr(self, src, dst, force=False, **kwargs):
+        self.__call()
+        src = self.scene.plugName(src)
+        dst = self.scene.plugName(dst)
+        current = self.scene.sources.get(dst)
+
+        if current == src:
+            raise RuntimeError("connectAttr: '{}' is already connected to '{}'.".format(src, dst))
+
+        if current is not None:
+            if not force:
+                raise RuntimeError("connectAttr: '{}' already has an incoming connection from '{}'.".format(dst, current))
+
+            self.scene.disconnect(current, dst)
+
+        self.scene.connect(src, dst)
+
+    def disconnectAttr(self, src, dst, **kwargs):
+        self.__call()
+        src = self.scene.plugName(src)
+        dst = self.scene.plugName(dst)
+
+        if self.scene.sources.get(dst) != src:
+            raise RuntimeError("disconnectAttr: There is no connection from '{}' to '{}' to disconnect".format(src, dst))
+
+        self.scene.disconnect(src, dst)
+
+    def isConnected(self, src, dst, **kwargs):
+        self.__call()
+
+        return self.scene.sources.get(self.scene.plugName(dst)) == self.scene.plugName(src)
+
+    def listConnections(self, name, connections=False, plugs=False, source=True, destination=True, type=None, **kwargs):
+        self.__call()
+        if "." in name:
+            node, attr = self.scene.findPlug(name)
+            attrs = [attr]
+        else:
+            node = self.scene.findNode(name)
+            attrs = list(node.attrs.keys())
+
+        allowed = set(Derived(type)) if type else None
+        results = []
+
+        for attr in attrs:
+            local = "{}.{}".format(node.name, attr)
+            remotes = []
+
+            if source and local in self.scene.sources:
+                remotes.append(self.scene.sources[local])
+
+            if destination:
+                remotes += self.scene.destinations.get(local, [])
+
+            for remote in remotes:
+                remote_node = remote.partition(".")[0]
+                if allowed is not None and self.scene.nodes[remote_node].type not in allowed:
+                    continue
+
+                if connections:
+                    results.append(local)
+
+                results.append(remote if plugs else remote_node)
+
+        return results
+
+    def listRelatives(self, name, children=False, parent=False, fullPath=False, **kwargs):
+        self.__call()
+        node = self.scene.findNode(name)
+
+        if parent:
+            names = [node.parent] if node.parent else []
+        else:
+            names = list(node.children)
+
+        if fullPath:
+            return [self.scene.fullPath(n) for n in names]
+
+        return names
+
+    def createNode(self, typeName, n=None, s=False, **kwargs):
+        self.__call()
+        if typeName not in NodeTypes:
+            raise RuntimeError("createNode: Unknown object type: {}".format(typeName))
+
+        name = self.scene.uniqueName(n or "{}1".format(typeName))
+
+        return self.scene.addNode(name, typeName).name
+
+    def delete(self, *names, **kwargs):
+        self.__call()
+        flat = []
+        for n in names:
+            flat += n if isinstance(n, (list, tuple)) else [n]
+
+        nodes = [self.scene.findNode(n) for n in flat]
+        for node in nodes:
+            self.scene.delete(node.name)
+
+    def file(self, path=None, **kwargs):
+        self.__call()
+        if kwargs.get("q") or kwargs.get("query"):
+            if kwargs.get("modified"):
+                return self.scene.modified
+
+            if kwargs.get("sceneName"):
+                return self.scene.path
+
+            return None
+
+        if kwargs.get("open"):
+            self.scene.path = path
+            self.scene.modified = False
+
+            return list(self.scene.nodes.keys()) if kwargs.get("returnNewNodes") else path
+
+        if kwargs.get("i") or kwargs.get("import") or kwargs.get("reference"):
+            prefix = kwargs.get("namespace", "")
+            prefix = prefix + ":" if prefix else ""
+            root = self.scene.addNode(self.scene.uniqueName(prefix + "asset1"), "transform")
+            shape = self.scene.addNode(self.scene.uniqueName(prefix + "assetShape1"), "mesh", root.name)
+            new_nodes = [self.scene.fullPath(root.name), self.scene.fullPath(shape.name)]
+
+            return new_nodes if kwargs.get("returnNewNodes") else path
+
+        return None
+
+
+class MainThread(object):
+    Lock = threading.Lock()
+    Latency = 0.0
+    Durations = []
+
+    @staticmethod
+    def ExecuteFunction(func, *args, **kwargs):
+        start = Clock()
+        with MainThread.Lock:
+            Spin(MainThread.Latency)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                MainThread.Durations.append(Clock() - start)
+
+
+class Packet(object):
+    def __init__(self, value, eop=False):
+        self.__value = value
+        self.__eop = eop
+
+    def isEOP(self):
+        return self.__eop
+
+    def value(self):
+        return self.__value
+
+    def drop(self):
+        pass
+
+
+class InPort(object):
+    def __init__(self, typeClass, name):
+        self.typeClass = typeClass
+        self.name = name
+        self.values = []
+        self.index = 0
+
+    def feed(self, values):
+        self.values = values
+        self.index = 0
+
+    def receive(self, timeout=None):
+        if self.index >= len(self.values):
+            return Packet(None, eop=True)
+
+        self.index += 1
+
+        return Packet(self.values[self.index - 1])
+
+
+class OutPort(object):
+    def __init__(self, typeClass, name):
+        self.typeClass = typeClass
+        self.name = name
+        self.values = []
+        self.first = None
+
+    def send(self, value, timeout=None):
+        try:
+            if not isinstance(value, self.typeClass):
+                value = self.typeClass(value)
+        except Exception:
+            return False
+
+        if self.first is None:
+            self.first = Clock()
+
+        self.values.append(value)
+
+        return True
+
+
+class Param(object):
+    def __init__(self, typeClass, name, value):
+        self.typeClass = typeClass
+        self.name = name
+        self.value = typeClass() if value is None else value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = self.typeClass(value)
+
+
+class Block(object):
+    def __init__(self):
+        self.inputs = OrderedDict()
+        self.outputs = OrderedDict()
+        self.params = OrderedDict()
+        self.warnings = []
+        self.initialize()
+
+    def initialize(self):
+        pass
+
+    def addInput(self, typeClass, name):
+        self.inputs[name] = InPort(typeClass, name)
+
+    def addOutput(self, typeClass, name):
+        self.outputs[name] = OutPort(typeClass, name)
+
+    def addParam(self, typeClass=None, name=None, value=None):
+        self.params[name] = Param(typeClass, name, value)
+
+    def input(self, name):
+        return self.inputs[name]
+
+    def output(self, name):
+        return self.outputs[name]
+
+    def param(self, name):
+        return self.params[name]
+
+    def warn(self, message):
+        self.warnings.append(message)
+
+    def debug(self, message):
+        pass
+
+    def error(self, message):
+        self.warnings.append(message)
+
+
+class OpenMaya(types.ModuleType):
+    class MObject(object):
+        kNullObj = None
+
+    class MObjectHandle(object):
+        def __init__(self, obj):
+            self.__obj = obj
+
+        def hashCode(self):
+            return hash(self.__obj)
+
+    class MFn(object):
+        kNumericAttribute = 1
+        kUnitAttribute = 2
+        kEnumAttribute = 3
+        kTypedAttribute = 4
+        kDagNode = 5
+
+    class MFnNumericData(object):
+        kInvalid = 0
+        kNumeric = 1
+
+    class MFnData(object):
+        kInvalid = 0
+        kAny = 1
+        kString = 2
+
+    class MAttribute(object):
+        Kinds = {"doubleLinear": 2, "doubleAngle": 2, "enum": 3, "string": 4}
+
+        def __init__(self, attrType):
+            self.attrType = attrType
+
+        def hasFn(self, fn):
+            return OpenMaya.MAttribute.Kinds.get(self.attrType, 1) == fn
+
+    class MFnNumericAttribute(object):
+        def __init__(self, attr):
+            self.__attr = attr
+
+        def numericType(self):
+            return OpenMaya.MFnNumericData.kNumeric
+
+    class MFnTypedAttribute(object):
+        def __init__(self, attr):
+            self.__attr = attr
+
+        def attrType(self):
+            return OpenMaya.MFnData.kString
+
+    class MNodeClass(object):
+        def __init__(self, typeName):
+            self.attributeCount = len(NodeTypes[typeName].attrs)
+
+    class MFnDependencyNode(object):
+        def __init__(self, obj):
+            self.__node = Cmds_.scene.findNode(obj)
+            self.typeName = self.__node.type
+
+        def attributeCount(self):
+            return len(self.__node.attrs)
+
+        def attribute(self, name):
+            return OpenMaya.MAttribute(self.__node.attrs[self.__node.short.get(name, name)][0])
+
+    class MMessage(object):
+        @staticmethod
+        def removeCallback(callbackId):
+            pass
+
+        @staticmethod
+        def removeCallbacks(callbackIds):
+            pass
+
+    class MSelectionList(object):
+        def __init__(self):
+            self.__items = []
+
+        def add(self, name):
+            Cmds_.scene.findNode(name.partition(".")[0])
+            self.__items.append(name)
+
+        def clear(self):
+            del self.__items[:]
+
+        def getDependNode(self, index):
+            return self.__items[index]
+
+        def length(self):
+            return len(self.__items)
+
+    def __init__(self):
+        super(OpenMaya, self).__init__("maya.api.OpenMaya")
+        callback = staticmethod(lambda *args, **kwargs: 0)
+        for message in ("MSceneMessage", "MDGMessage", "MNodeMessage", "MDagMessage", "MEventMessage", "MCommandMessage"):
+            cls = type(message, (object, ), {})
+            for name in ("addCallback", "addStringArrayCallback", "addNodeAddedCallback", "addNodeRemovedCallback", "addConnectionCallback",
+                         "addNameChangedCallback", "addAttributeAddedOrRemovedCallback", "addAttributeChangedCallback",
+                         "addParentAddedCallback", "addParentRemovedCallback", "addEventCallback", "addCommandCallback"):
+                setattr(cls, name, callback)
+
+            for name in ("kAfterOpen", "kAfterNew", "kAfterPluginLoad", "kAfterPluginUnload", "kBeforeSave", "kAfterImport", "kAfterReference",
+                         "kAfterLoadReference", "kAfterUnloadReference", "kAfterRemoveReference"):
+                setattr(cls, name, 0)
+
+            setattr(self, message, cls)
+
+        self.MObject = OpenMaya.MObject
+        self.MObjectHandle = OpenMaya.MObjectHandle
+        self.MFn = OpenMaya.MFn
+        self.MFnNumericData = OpenMaya.MFnNumericData
+        self.MFnData = OpenMaya.MFnData
+        self.MFnNumericAttribute = OpenMaya.MFnNumericAttribute
+        self.MFnTypedAttribute = OpenMaya.MFnTypedAttribute
+        self.MNodeClass = OpenMaya.MNodeClass
+        self.MFnDependencyNode = OpenMaya.MFnDependencyNode
+        self.MMessage = OpenMaya.MMessage
+        self.MSelectionList = OpenMaya.MSelectionList
+
+
+Cmds_ = Cmds()
+
+
+def Install(scene=None, latency=0.0, dispatchLatency=0.0):
+    if "maya.cmds" not in sys.modules or sys.modules["maya.cmds"] is not Cmds_:
+        maya = types.ModuleType("maya")
+        api = types.ModuleType("maya.api")
+        open_maya = OpenMaya()
+        maya.cmds = Cmds_
+        maya.api = api
+        api.OpenMaya = open_maya
+
+        petit_bloc = types.ModuleType("petitBloc")
+        block = types.ModuleType("petitBloc.block")
+        exts = types.ModuleType("petitBloc.exts")
+        maya_exts = types.ModuleType("petitBloc.exts.mayaExts")
+        block.Block = Block
+        maya_exts.ExecuteFunction = MainThread.ExecuteFunction
+        petit_bloc.block = block
+        petit_bloc.exts = exts
+        exts.mayaExts = maya_exts
+
+        sys.modules.update({"maya": maya, "maya.cmds": Cmds_, "maya.api": api, "maya.api.OpenMaya": open_maya,
+                            "petitBloc": petit_bloc, "petitBloc.block": block, "petitBloc.exts": exts, "petitBloc.exts.mayaExts": maya_exts})
+
+    Cmds_.scene = scene if scene is not None else Scene()
+    Cmds_.latency = latency
+    MainThread.Latency = dispatchLatency
+    del MainThread.Durations[:]
+
+    return Cmds_
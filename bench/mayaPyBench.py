@@ -0,0 +1,285 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import fakeMaya
+
+
+RepoRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DefaultSizes = [1000, 10000, 100000, 1000000]
+
+
+def LoadModule():
+    fakeMaya.Install()
+    sys.path.insert(0, os.path.join(RepoRoot, "maya"))
+    try:
+        return importlib.import_module("mayaPy")
+    finally:
+        sys.path.pop(0)
+
+
+def Plugs(scene, kinds=None):
+    plugs = []
+    for name, node in scene.nodes.items():
+        for attr, data in node.attrs.items():
+            if kinds is None or data[0] in kinds:
+                plugs.append("{}.{}".format(name, attr))
+
+    return plugs
+
+
+def Nodes(scene, typeName=None):
+    return [n for n, node in scene.nodes.items() if typeName is None or node.type == typeName]
+
+
+Numeric = ["bool", "doubleLinear", "doubleAngle", "double", "long", "short", "byte", "enum", "float"]
+
+
+def Connections(scene):
+    return sorted(scene.sources.items(), key=lambda x: x[0])
+
+
+def SetNumericInputs(scene):
+    attrs = Plugs(scene, ["double", "float"])
+    values = [float(i % 7) for i in range(len(attrs))]
+
+    return {"attr": attrs, "value": values, "values": [values]}
+
+
+def Cases():
+    return {
+        "MayaPyFileOpen": ({}, {"file": "bench.ma"}),
+        "MayaPyFileImport": (lambda s: {"file": ["asset.ma"] * max(1, len(s.nodes) // 10), "namespace": ["ns{}".format(i) for i in range(max(1, len(s.nodes) // 10))]}, {}),
+        "MayaPyLs": ({}, {"pattern": "*"}),
+        "MayaPyExist": (lambda s: {"name": Nodes(s) + ["missing{}".format(i) for i in range(len(s.nodes) // 10)]}, {}),
+        "MayaPyListAttr": (lambda s: {"object": Nodes(s)}, {}),
+        "MayaPyGetAttrType": (lambda s: {"attr": Plugs(s)}, {}),
+        "MayaPyAttrSelectorNumeric": (lambda s: {"attr": Plugs(s)}, {}),
+        "MayaPyAttrSelectorString": (lambda s: {"attr": Plugs(s)}, {}),
+        "MayaPyGetAttrNumeric": (lambda s: {"attr": Plugs(s, Numeric)}, {}),
+        "MayaPyFusedAttrQuery": ({}, {"pattern": "*"}),
+        "MayaPyGetAttrString": (lambda s: {"attr": Plugs(s, ["string"])}, {}),
+        "MayaPySetAttrNumeric": (lambda s: SetNumericInputs(s), {}),
+        "MayaPySetAttrString": (lambda s: {"attr": Plugs(s, ["string"]), "value": ["tag{}".format(i % 7) for i in range(len(Plugs(s, ["string"])))]}, {}),
+        "MayaPyConnectAttr": (lambda s: {"source": ["{}.translateY".format(n) for n in Nodes(s, "transform")], "destination": ["{}.userValue".format(n) for n in Nodes(s, "transform")]}, {}),
+        "MayaPyDisconnectAttr": (lambda s: {"source": [c[1] for c in Connections(s)], "destination": [c[0] for c in Connections(s)]}, {}),
+        "MayaPyIsConnected": (lambda s: {"source": [c[1] for c in Connections(s)], "destination": [c[0] for c in Connections(s)]}, {}),
+        "MayaPyCreateNode": (lambda s: {"name": ["bench{}".format(i) for i in range(len(s.nodes))], "nodeType": ["network"]}, {}),
+        "MayaPyDelete": (lambda s: {"node": Nodes(s, "multiplyDivide")}, {}),
+        "MayaPyListConnections": (lambda s: {"name": Nodes(s)}, {"srcConnection": True, "dstConnection": True}),
+        "MayaPyListChildren": (lambda s: {"name": Nodes(s, "transform")}, {}),
+        "MayaPyListParents": (lambda s: {"name": Nodes(s, "transform")}, {}),
+    }
+
+
+def ResetCaches(module):
+    for name in ("ClearAttrTypeCache", ):
+        if hasattr(module.MayaUtil, name):
+            getattr(module.MayaUtil, name)()
+
+    if hasattr(module.MayaUtil, "NodeTypeSets"):
+        module.MayaUtil.NodeTypeSets = None
+
+    if hasattr(module, "MayaSceneIndex"):
+        module.MayaSceneIndex.Dirty = True
+
+    if hasattr(module, "MayaSceneMemo"):
+        module.MayaSceneMemo.Clear()
+
+    if hasattr(module.MayaPyFileOpen, "WarmScene"):
+        module.MayaPyFileOpen.WarmScene = None
+
+
+def Percentile(values, pct):
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))
+
+    return values[index]
+
+
+def Prepare(module, blockName, plugs, params, latency, dispatchLatency):
+    scene = fakeMaya.Scene.Generate(plugs)
+    fakeMaya.Install(scene, latency, dispatchLatency)
+    ResetCaches(module)
+
+    inputs, case_params = Cases()[blockName]
+    if callable(inputs):
+        inputs = inputs(scene)
+
+    blk = getattr(module, blockName)()
+
+    for name, value in list(case_params.items()) + list(params.items()):
+        if name in blk.params:
+            blk.param(name).set(value)
+
+    items = 0
+    for name, values in inputs.items():
+        blk.input(name).feed(values)
+        items = max(items, len(values))
+
+    return blk, items
+
+
+def RunOnce(module, blockName, plugs, params, latency, dispatchLatency, memory):
+    blk, items = Prepare(module, blockName, plugs, params, latency, dispatchLatency)
+
+    peak = None
+    if memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    gc.collect()
+    start = fakeMaya.Clock()
+    blk.run()
+    end = fakeMaya.Clock()
+
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    firsts = [p.first for p in blk.outputs.values() if p.first is not None]
+    outputs = sum(len(p.values) for p in blk.outputs.values())
+    items = items or outputs
+
+    return {"seconds": end - start,
+            "items": items,
+            "outputs": outputs,
+            "first_result": (min(firsts) - start) if firsts else None,
+            "dispatches": list(fakeMaya.MainThread.Durations),
+            "warnings": len(blk.warnings),
+            "peak_bytes": peak}
+
+
+def Bench(module, blockName, plugs, params, repeat, latency, dispatchLatency, memory):
+    runs = [RunOnce(module, blockName, plugs, params, latency, dispatchLatency, False) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["seconds"])
+    dispatches = []
+    for r in runs:
+        dispatches += r["dispatches"]
+
+    result = {"block": blockName,
+              "plugs": plugs,
+              "params": params,
+              "items": best["items"],
+              "outputs": best["outputs"],
+              "warnings": best["warnings"],
+              "seconds": best["seconds"],
+              "throughput": best["items"] / best["seconds"] if best["seconds"] > 0 else 0.0,
+              "first_result": best["first_result"],
+              "dispatch_count": len(best["dispatches"]),
+              "dispatch_p50": Percentile(dispatches, 50),
+              "dispatch_p90": Percentile(dispatches, 90),
+              "dispatch_p99": Percentile(dispatches, 99),
+              "peak_bytes": None}
+
+    if memory:
+        result["peak_bytes"] = RunOnce(module, blockName, plugs, params, latency, dispatchLatency, True)["peak_bytes"]
+
+    return result
+
+
+def GitRevision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=RepoRoot, stderr=subprocess.STDOUT).decode().strip()
+    except Exception:
+        return None
+
+
+def Compare(results, basePath, threshold):
+    with open(basePath) as f:
+        base = json.load(f)
+
+    base_map = dict(((r["block"], r["plugs"], json.dumps(r["params"], sort_keys=True)), r) for r in base["results"])
+    regressions = 0
+
+    print("{:<28}{:>10}{:>14}{:>14}{:>9}".format("block", "plugs", "base(s)", "now(s)", "ratio"))
+    for r in results:
+        b = base_map.get((r["block"], r["plugs"], json.dumps(r["params"], sort_keys=True)))
+        if b is None or b["seconds"] <= 0:
+            continue
+
+        ratio = r["seconds"] / b["seconds"]
+        flag = ""
+        if ratio > 1.0 + threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+
+        print("{:<28}{:>10}{:>14.4f}{:>14.4f}{:>9.2f}{}".format(r["block"], r["plugs"], b["seconds"], r["seconds"], ratio, flag))
+
+    return regressions
+
+
+def ParseParams(values):
+    params = {}
+    for v in values or []:
+        key, _, raw = v.partition("=")
+        try:
+            params[key] = json.loads(raw)
+        except ValueError:
+            params[key] = raw
+
+    return params
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the MayaPy blocks against a fake maya.cmds scene")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DefaultSizes), help="comma separated plug counts")
+    parser.add_argument("--blocks", default="", help="comma separated block names (default: all)")
+    parser.add_argument("--param", action="append", help="block param override, e.g. chunkSize=1000")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds spent in every fake cmds call")
+    parser.add_argument("--dispatch-latency", type=float, default=0.0, help="seconds spent in every main thread dispatch")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--output", default="", help="write results to this JSON file")
+    parser.add_argument("--compare", default="", help="compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown ratio before flagging a regression")
+    args = parser.parse_args(argv)
+
+    module = LoadModule()
+    blocks = [b for b in args.blocks.split(",") if b] or sorted(Cases().keys())
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    params = ParseParams(args.param)
+    results = []
+
+    print("{:<28}{:>10}{:>10}{:>12}{:>14}{:>12}{:>12}{:>12}".format("block", "plugs", "items", "seconds", "items/s", "first(ms)", "p99(ms)", "peak(KB)"))
+    for blockName in blocks:
+        for plugs in sizes:
+            r = Bench(module, blockName, plugs, params, args.repeat, args.latency, args.dispatch_latency, not args.no_memory)
+            results.append(r)
+            print("{:<28}{:>10}{:>10}{:>12.4f}{:>14.0f}{:>12}{:>12.3f}{:>12}".format(
+                blockName, plugs, r["items"], r["seconds"], r["throughput"],
+                "-" if r["first_result"] is None else "{:.3f}".format(r["first_result"] * 1000.0),
+                r["dispatch_p99"] * 1000.0,
+                "-" if r["peak_bytes"] is None else r["peak_bytes"] // 1024))
+            sys.stdout.flush()
+
+    report = {"meta": {"revision": GitRevision(),
+                       "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                       "latency": args.latency,
+                       "dispatch_latency": args.dispatch_latency,
+                       "repeat": args.repeat},
+              "results": results}
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        return 1 if Compare(results, args.compare, args.threshold) else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
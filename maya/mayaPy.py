@@ -1,35 +1,1922 @@
 from petitBloc import block
-from petitBloc.exts import mayaExts
-from maya import cmds
 from numbers import Number
+from array import array
+import atexit
+import importlib
+import itertools
+import json
+import math
+import mmap
+import multiprocessing
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+try:
+    import Queue as queue
+except ImportError:
+    import queue
+try:
+    basestring
+except NameError:
+    basestring = str
+
+
+class MayaModule(object):
+    def __init__(self, name):
+        self.__name = name
+        self.__module = None
+
+    def isLoaded(self):
+        return self.__module is not None
+
+    def module(self):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+
+        return self.__module
+
+    def __getattr__(self, name):
+        value = getattr(self.module(), name)
+        setattr(self, name, value)
+
+        return value
+
+
+class MayaDoubleArray(array):
+    def __new__(cls, values=None):
+        if isinstance(values, MayaDoubleArray):
+            return values
+
+        arr = array.__new__(cls, "d")
+        if values is None:
+            return arr
+
+        if isinstance(values, Number):
+            arr.append(values)
+        elif hasattr(values, "dtype") and hasattr(values, "tobytes"):
+            data = values.astype("float64").tobytes()
+            if hasattr(arr, "frombytes"):
+                arr.frombytes(data)
+            else:
+                arr.fromstring(data)
+        else:
+            arr.extend(values)
+
+        return arr
+
+    def __reduce__(self):
+        return (self.__class__, (array("d", self), ))
+
+
+mayaExts = MayaModule("petitBloc.exts.mayaExts")
+cmds = MayaModule("maya.cmds")
+om = MayaModule("maya.api.OpenMaya")
+
+
+class MayaUtil:
+    Numeric = ["bool", "doubleLinear", "doubleAngle", "double", "long", "short", "byte", "enum", "float"]
+    String = ["string"]
+    IndexPattern = re.compile(r"\[\d+\]")
+    RootPattern = re.compile(r"[.\[]")
+    WildcardPattern = re.compile(r"[*?]")
+    StaticAttrTypes = {}
+    StaticAttrLists = {}
+    StaticAttrCounts = {}
+    StaticListAttrFlags = set(["read", "r", "write", "w", "scalar", "s", "array", "a", "leaf", "lf", "visible", "v", "internal", "i",
+                               "hasData", "hd", "hasNullData", "hnd", "usedAsFilename", "uaf", "fromPlugin", "fp",
+                               "shortNames", "sn", "category", "ct", "categoryInclude"])
+    DynamicAttrTypes = {}
+    NodeInfos = {}
+    NodeKeys = {}
+    NodeRevision = 0
+    NodeCallbacks = []
+    CacheCallbacks = []
+    NodeTypeSets = None
+    PluginCallbacks = []
+    MFnTypes = {"dagNode": "kDagNode", "transform": "kTransform", "joint": "kJoint", "shape": "kShape", "mesh": "kMesh",
+                "nurbsCurve": "kNurbsCurve", "nurbsSurface": "kNurbsSurface", "camera": "kCamera", "locator": "kLocator",
+                "light": "kLight", "shadingEngine": "kShadingEngine", "lambert": "kLambert", "file": "kFileTexture",
+                "animCurve": "kAnimCurve", "blendShape": "kBlendShape", "skinCluster": "kSkinClusterFilter",
+                "objectSet": "kSet", "reference": "kReference", "displayLayer": "kDisplayLayer"}
+
+    @staticmethod
+    def IsNumeric(typeName):
+        return typeName in MayaUtil.Numeric
+
+    @staticmethod
+    def IsString(typeName):
+        return typeName in MayaUtil.String
+
+    @staticmethod
+    def Execute(func, *args, **kwargs):
+        if MayaProfiler.Enabled:
+            return MayaProfiler.Execute(func, *args, **kwargs)
+
+        return MayaUtil.Dispatch(func, *args, **kwargs)
+
+    @staticmethod
+    def Dispatch(func, *args, **kwargs):
+        if MayaDispatcher.Enabled:
+            return MayaDispatcher.Submit(func, *args, **kwargs)
+
+        return mayaExts.ExecuteFunction(func, *args, **kwargs)
+
+    @staticmethod
+    def UseApi(blk):
+        if not blk.param("useApi").get():
+            return False
+
+        if blk.param("bulkWrite").get() and not blk.param("disableUndo").get():
+            blk.warn("useApi is ignored in an undoable bulk write, api modifiers are not recorded in the undo chunk")
+            return False
+
+        return True
+
+    @staticmethod
+    def ExecuteWrite(blk, func, *args, **kwargs):
+        if not blk.param("bulkWrite").get():
+            return MayaUtil.Execute(func, *args, **kwargs)
+
+        return MayaUtil.Execute(MayaBulkWrite.Call, blk.param("disableUndo").get(), func, *args, **kwargs)
+
+    @staticmethod
+    def AttrType(attr):
+        MayaUtil.InstallCacheCallbacks()
+
+        node, _, attr_path = attr.partition(".")
+        info = None
+        if attr_path:
+            info = MayaUtil.NodeInfo(node)
+
+        if info is None:
+            return cmds.getAttr(attr, type=True)
+
+        node_type, dynamic_attrs = info
+
+        if MayaUtil.RootPattern.split(attr_path, 1)[0] in dynamic_attrs:
+            cache = MayaUtil.DynamicAttrTypes.setdefault(node, {})
+        else:
+            cache = MayaUtil.StaticAttrTypes.setdefault(node_type, {})
+
+        key = MayaUtil.IndexPattern.sub("[]", attr_path)
+        if key not in cache:
+            type_str = cmds.getAttr(attr, type=True)
+            cache[key] = type_str if MayaUtil.HasFixedType(node, attr_path) else None
+
+            return type_str
+
+        if cache[key] is None:
+            return cmds.getAttr(attr, type=True)
+
+        return cache[key]
+
+    @staticmethod
+    def StaticAttrCount(nodeType):
+        count = MayaUtil.StaticAttrCounts.get(nodeType)
+        if count is None:
+            count = om.MNodeClass(nodeType).attributeCount
+            MayaUtil.StaticAttrCounts[nodeType] = count
+
+        return count
+
+    @staticmethod
+    def HasFixedType(node, attrPath):
+        try:
+            sel = om.MSelectionList()
+            sel.add(node)
+            attr = om.MFnDependencyNode(sel.getDependNode(0)).attribute(MayaUtil.IndexPattern.sub("", attrPath).rpartition(".")[2])
+        except:
+            return False
+
+        if attr.hasFn(om.MFn.kNumericAttribute):
+            return om.MFnNumericAttribute(attr).numericType() != om.MFnNumericData.kInvalid
+
+        if attr.hasFn(om.MFn.kUnitAttribute) or attr.hasFn(om.MFn.kEnumAttribute):
+            return True
+
+        if attr.hasFn(om.MFn.kTypedAttribute):
+            return om.MFnTypedAttribute(attr).attrType() not in (om.MFnData.kAny, om.MFnData.kInvalid)
+
+        return False
+
+    @staticmethod
+    def NodeInfo(node):
+        info = MayaUtil.NodeInfos.get(node)
+        if info is not None:
+            return info
+
+        try:
+            node_type = cmds.nodeType(node)
+            sel = om.MSelectionList()
+            sel.add(node)
+            key = om.MObjectHandle(sel.getDependNode(0)).hashCode()
+        except:
+            return None
+
+        dynamic_attrs = set()
+        for a in (cmds.listAttr(node, userDefined=True) or []) + (cmds.listAttr(node, userDefined=True, shortNames=True) or []):
+            dynamic_attrs.update(a.split("."))
+
+        info = (node_type, dynamic_attrs)
+        MayaUtil.NodeInfos[node] = info
+        MayaUtil.NodeKeys.setdefault(key, set()).add(node)
+
+        return info
+
+    @staticmethod
+    def ForgetNode(key):
+        for name in MayaUtil.NodeKeys.pop(key, ()):
+            MayaUtil.NodeInfos.pop(name, None)
+            MayaUtil.DynamicAttrTypes.pop(name, None)
+
+    @staticmethod
+    def ForgetDagPaths():
+        for key, names in list(MayaUtil.NodeKeys.items()):
+            for name in [n for n in names if "|" in n]:
+                names.discard(name)
+                MayaUtil.NodeInfos.pop(name, None)
+                MayaUtil.DynamicAttrTypes.pop(name, None)
+
+            if not names:
+                MayaUtil.NodeKeys.pop(key, None)
+
+    @staticmethod
+    def InstallCacheCallbacks():
+        if MayaUtil.CacheCallbacks:
+            return
+
+        MayaUtil.CacheCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, MayaUtil.__onSceneOpened))
+        MayaUtil.CacheCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, MayaUtil.__onSceneOpened))
+        MayaUtil.CacheCallbacks.append(om.MDGMessage.addNodeRemovedCallback(MayaUtil.__onNodeRemoved, "dependNode"))
+        MayaUtil.CacheCallbacks.append(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, MayaUtil.__onNameChanged))
+        MayaUtil.CacheCallbacks.append(om.MDagMessage.addParentAddedCallback(MayaUtil.__onParentAdded))
+        MayaUtil.CacheCallbacks.append(om.MCommandMessage.addCommandCallback(MayaUtil.__onCommand))
+
+    @staticmethod
+    def ClearAttrTypeCache():
+        MayaUtil.StaticAttrTypes.clear()
+        MayaUtil.StaticAttrLists.clear()
+        MayaUtil.StaticAttrCounts.clear()
+        MayaUtil.ClearNodeCache()
+
+    @staticmethod
+    def ClearNodeCache():
+        MayaUtil.NodeKeys.clear()
+        MayaUtil.NodeInfos.clear()
+        MayaUtil.DynamicAttrTypes.clear()
+
+    @staticmethod
+    def __onSceneOpened(*args):
+        MayaUtil.ClearAttrTypeCache()
+
+    @staticmethod
+    def __onNodeRemoved(node, *args):
+        MayaUtil.ForgetNode(om.MObjectHandle(node).hashCode())
+
+    @staticmethod
+    def __onNameChanged(node, *args):
+        MayaUtil.ForgetNode(om.MObjectHandle(node).hashCode())
+        if node.hasFn(om.MFn.kDagNode):
+            MayaUtil.ForgetDagPaths()
+
+    @staticmethod
+    def __onParentAdded(child, *args):
+        MayaUtil.ForgetNode(om.MObjectHandle(child.node()).hashCode())
+        MayaUtil.ForgetDagPaths()
+
+    @staticmethod
+    def __onCommand(command, *args):
+        if command.split(" ", 1)[0] in MayaSceneMemo.StructureCommands:
+            MayaUtil.ClearNodeCache()
+
+    @staticmethod
+    def NodeTypes():
+        node_types = MayaUtil.NodeTypeSets
+        if node_types is None:
+            node_types = MayaUtil.Execute(MayaUtil.__buildNodeTypes)
+            MayaUtil.NodeTypeSets = node_types
+
+        return node_types[0]
+
+    @staticmethod
+    def NodeTypeKind(nodeType):
+        if MayaUtil.NodeTypeSets is None:
+            MayaUtil.NodeTypeSets = MayaUtil.__buildNodeTypes()
+
+        all_types, transform_types, dag_types = MayaUtil.NodeTypeSets
+
+        if nodeType in transform_types:
+            return "transform"
+
+        if nodeType in dag_types:
+            return "dag"
+
+        return "dg"
+
+    @staticmethod
+    def __buildNodeTypes():
+        if not MayaUtil.PluginCallbacks:
+            MayaUtil.PluginCallbacks.append(om.MSceneMessage.addStringArrayCallback(om.MSceneMessage.kAfterPluginLoad, MayaUtil.__onPluginChanged))
+            MayaUtil.PluginCallbacks.append(om.MSceneMessage.addStringArrayCallback(om.MSceneMessage.kAfterPluginUnload, MayaUtil.__onPluginChanged))
+
+        all_types = frozenset(cmds.allNodeTypes() or [])
+        transform_types = frozenset(cmds.nodeType("transform", derived=True, isTypeName=True) or [])
+        dag_types = frozenset(cmds.nodeType("dagNode", derived=True, isTypeName=True) or [])
+
+        return (all_types, transform_types, dag_types)
+
+    @staticmethod
+    def __onPluginChanged(*args):
+        MayaUtil.NodeTypeSets = None
+
+    @staticmethod
+    def NamePattern(pattern):
+        regex = re.escape(pattern).replace("\\*", "[^:|]*").replace("\\?", "[^:|]")
+
+        return re.compile(regex + "$")
+
+    @staticmethod
+    def IterNodes(pattern, nodeType):
+        allowed = None
+        filter_type = om.MFn.kInvalid
+
+        if nodeType:
+            allowed = frozenset(cmds.nodeType(nodeType, derived=True, isTypeName=True) or [nodeType])
+            filter_type = getattr(om.MFn, MayaUtil.MFnTypes.get(nodeType, "kInvalid"))
+
+        match = None
+        match_path = False
+        if pattern:
+            match = MayaUtil.NamePattern(pattern).match
+            match_path = "|" in pattern
+
+        it = om.MItDependencyNodes(filter_type)
+
+        while not it.isDone():
+            node = it.thisNode()
+            it.next()
+
+            fn = om.MFnDependencyNode(node)
+            if allowed is not None and fn.typeName not in allowed:
+                continue
+
+            if node.hasFn(om.MFn.kDagNode):
+                path = om.MDagPath.getAPathTo(node)
+                name = path.partialPathName()
+                if match is not None and not match(path.fullPathName() if match_path else fn.name()):
+                    continue
+            else:
+                name = fn.name()
+                if match is not None and not match(name):
+                    continue
+
+            yield name
+
+    @staticmethod
+    def WatchNodes():
+        if MayaUtil.NodeCallbacks:
+            return
+
+        MayaUtil.NodeCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, MayaUtil.__onNodesChanged))
+        MayaUtil.NodeCallbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, MayaUtil.__onNodesChanged))
+        MayaUtil.NodeCallbacks.append(om.MDGMessage.addNodeAddedCallback(MayaUtil.__onNodesChanged, "dependNode"))
+        MayaUtil.NodeCallbacks.append(om.MDGMessage.addNodeRemovedCallback(MayaUtil.__onNodesChanged, "dependNode"))
+
+    @staticmethod
+    def __onNodesChanged(*args):
+        MayaUtil.NodeRevision += 1
+
+    @staticmethod
+    def FindPlug(name):
+        try:
+            sel = om.MSelectionList()
+            sel.add(name)
+            return sel.getPlug(0)
+        except:
+            return None
+
+    @staticmethod
+    def PlugKind(plug):
+        if plug.isArray or plug.isCompound:
+            return None
+
+        attr = plug.attribute()
+
+        if attr.hasFn(om.MFn.kNumericAttribute):
+            numeric_type = om.MFnNumericAttribute(attr).numericType()
+            if numeric_type == om.MFnNumericData.kBoolean:
+                return "bool"
+
+            if numeric_type in (om.MFnNumericData.kByte, om.MFnNumericData.kChar, om.MFnNumericData.kShort, om.MFnNumericData.kInt, om.MFnNumericData.kInt64, om.MFnNumericData.kAddr):
+                return "int"
+
+            if numeric_type == om.MFnNumericData.kFloat:
+                return "float"
+
+            if numeric_type == om.MFnNumericData.kDouble:
+                return "double"
+
+            return None
+
+        if attr.hasFn(om.MFn.kUnitAttribute):
+            unit_type = om.MFnUnitAttribute(attr).unitType()
+            if unit_type == om.MFnUnitAttribute.kAngle:
+                return "angle"
+
+            if unit_type == om.MFnUnitAttribute.kDistance:
+                return "distance"
+
+            if unit_type == om.MFnUnitAttribute.kTime:
+                return "time"
+
+            return None
+
+        if attr.hasFn(om.MFn.kEnumAttribute):
+            return "int"
+
+        if attr.hasFn(om.MFn.kTypedAttribute):
+            if om.MFnTypedAttribute(attr).attrType() == om.MFnData.kString:
+                return "string"
+
+        return None
+
+    @staticmethod
+    def HasLimits(plug):
+        attr = plug.attribute()
+
+        if attr.hasFn(om.MFn.kNumericAttribute):
+            fn = om.MFnNumericAttribute(attr)
+        elif attr.hasFn(om.MFn.kUnitAttribute):
+            fn = om.MFnUnitAttribute(attr)
+        else:
+            return False
+
+        return fn.hasMin() or fn.hasMax()
+
+    @staticmethod
+    def ReadNumericPlug(plug):
+        kind = MayaUtil.PlugKind(plug)
+
+        if kind == "bool":
+            return plug.asBool()
+
+        if kind == "int":
+            return plug.asInt()
+
+        if kind == "float":
+            return plug.asFloat()
+
+        if kind == "double":
+            return plug.asDouble()
+
+        if kind == "angle":
+            return plug.asMAngle().asUnits(om.MAngle.uiUnit())
+
+        if kind == "distance":
+            return plug.asMDistance().asUnits(om.MDistance.uiUnit())
+
+        if kind == "time":
+            return plug.asMTime().asUnits(om.MTime.uiUnit())
+
+        return None
+
+    @staticmethod
+    def IsPlugWritable(plug):
+        return plug is not None and plug.isFreeToChange() == om.MPlug.kFreeToChange
+
+    @staticmethod
+    def MeshFn(name):
+        try:
+            sel = om.MSelectionList()
+            sel.add(name)
+            dag = sel.getDagPath(0)
+            if not dag.node().hasFn(om.MFn.kMesh):
+                dag.extendToShape()
+
+            if not dag.node().hasFn(om.MFn.kMesh):
+                return None
+
+            return om.MFnMesh(dag)
+        except:
+            return None
+
+    @staticmethod
+    def MeshSpace(worldSpace):
+        return om.MSpace.kWorld if worldSpace else om.MSpace.kObject
+
+    @staticmethod
+    def QueueNumericPlugValue(mod, attr, value):
+        plug = MayaUtil.FindPlug(attr)
+        if not MayaUtil.IsPlugWritable(plug):
+            return False
+
+        kind = MayaUtil.PlugKind(plug)
+        if kind is None or kind == "string" or MayaUtil.HasLimits(plug):
+            return False
+
+        if kind == "bool":
+            mod.newPlugValueBool(plug, bool(value))
+        elif kind == "int":
+            if math.isnan(value) or math.isinf(value) or value != int(value):
+                return False
+
+            mod.newPlugValueInt(plug, int(value))
+        elif kind == "float":
+            mod.newPlugValueFloat(plug, value)
+        elif kind == "double":
+            mod.newPlugValueDouble(plug, value)
+        elif kind == "angle":
+            mod.newPlugValueMAngle(plug, om.MAngle(value, om.MAngle.uiUnit()))
+        elif kind == "distance":
+            mod.newPlugValueMDistance(plug, om.MDistance(value, om.MDistance.uiUnit()))
+        elif kind == "time":
+            mod.newPlugValueMTime(plug, om.MTime(value, om.MTime.uiUnit()))
+
+        return True
+
+    @staticmethod
+    def QueueStringPlugValue(mod, attr, value):
+        plug = MayaUtil.FindPlug(attr)
+        if not MayaUtil.IsPlugWritable(plug) or MayaUtil.PlugKind(plug) != "string":
+            return False
+
+        mod.newPlugValueString(plug, value)
+
+        return True
+
+    @staticmethod
+    def QueueConnect(mod, src, dst):
+        src_plug = MayaUtil.FindPlug(src)
+        dst_plug = MayaUtil.FindPlug(dst)
+        if src_plug is None or dst_plug is None or dst_plug.isLocked:
+            return False
+
+        if dst_plug.isDestination:
+            current = dst_plug.source()
+            if current == src_plug:
+                return False
+
+            mod.disconnect(current, dst_plug)
+
+        mod.connect(src_plug, dst_plug)
+
+        return True
+
+    @staticmethod
+    def QueueDisconnect(mod, src, dst):
+        src_plug = MayaUtil.FindPlug(src)
+        dst_plug = MayaUtil.FindPlug(dst)
+        if src_plug is None or dst_plug is None or dst_plug.isLocked:
+            return False
+
+        if not dst_plug.isDestination or dst_plug.source() != src_plug:
+            return False
+
+        mod.disconnect(src_plug, dst_plug)
+
+        return True
+
+    @staticmethod
+    def BatchModify(items, queue, fallback, modifierType=None):
+        if modifierType is None:
+            modifierType = om.MDGModifier
+
+        results = []
+        queued = []
+        mod = modifierType()
+
+        def flush():
+            if not queued:
+                return
+
+            try:
+                mod.doIt()
+                for i in queued:
+                    results[i] = True
+            except:
+                try:
+                    mod.undoIt()
+                except:
+                    pass
+
+                for i in queued:
+                    results[i] = fallback(*items[i])
+
+            del queued[:]
+
+        for item in items:
+            results.append(False)
+
+            if queue(mod, *item):
+                queued.append(len(results) - 1)
+                continue
+
+            if queued:
+                flush()
+                mod = modifierType()
+
+            results[-1] = fallback(*item)
+
+        flush()
+
+        return results
+
+    @staticmethod
+    def DagOwners(paths):
+        owners = {}
+        for path, node in paths.items():
+            parent = path.rpartition("|")[0]
+            while parent:
+                if parent in paths:
+                    owners[node] = paths[parent]
+
+                parent = parent.rpartition("|")[0]
+
+        return owners
+
+    @staticmethod
+    def ReceiveChunks(inp, chunkSize):
+        chunk = []
+
+        while (True):
+            p = inp.receive()
+            if p.isEOP():
+                break
+
+            chunk.append(p.value())
+            p.drop()
+
+            if chunkSize > 0 and len(chunk) >= chunkSize:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def ReceivePairChunks(inA, inB, chunkSize):
+        chunk = []
+
+        while (True):
+            a_p = inA.receive()
+            if a_p.isEOP():
+                break
+
+            a = a_p.value()
+            a_p.drop()
+
+            b_p = inB.receive()
+            if b_p.isEOP():
+                break
+
+            b = b_p.value()
+            b_p.drop()
+
+            chunk.append((a, b))
+
+            if chunkSize > 0 and len(chunk) >= chunkSize:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def ReceiveRowChunks(ports, chunkSize):
+        chunk = []
+
+        while (True):
+            row = []
+            for port in ports:
+                p = port.receive()
+                if p.isEOP():
+                    break
+
+                row.append(p.value())
+                p.drop()
+
+            if len(row) != len(ports):
+                break
+
+            chunk.append(tuple(row))
+
+            if chunkSize > 0 and len(chunk) >= chunkSize:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+
+class MayaCmdsProxy(object):
+    def __init__(self, module):
+        self.__module = module
+
+    def module(self):
+        return self.__module
+
+    def __getattr__(self, name):
+        func = getattr(self.__module, name)
+        if not callable(func):
+            return func
+
+        def timed(*args, **kwargs):
+            start = MayaProfiler.Clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                MayaProfiler.CountCall(name, MayaProfiler.Clock() - start)
+
+        setattr(self, name, timed)
+
+        return timed
+
+
+class MayaTimedPort(object):
+    def __init__(self, port):
+        self.__port = port
+
+    def receive(self, *args, **kwargs):
+        start = MayaProfiler.Clock()
+        p = self.__port.receive(*args, **kwargs)
+        MayaProfiler.AddPhase("receive", MayaProfiler.Clock() - start, "received", 0 if p.isEOP() else 1)
+
+        return p
+
+    def send(self, *args, **kwargs):
+        start = MayaProfiler.Clock()
+        res = self.__port.send(*args, **kwargs)
+        MayaProfiler.AddPhase("send", MayaProfiler.Clock() - start, "sent", 1)
+
+        return res
+
+    def __getattr__(self, name):
+        return getattr(self.__port, name)
+
+
+class MayaProfiler:
+    Enabled = False
+    Clock = getattr(time, "perf_counter", time.time)
+    Origin = Clock()
+    Lock = threading.Lock()
+    Local = threading.local()
+    Events = []
+    CmdsStats = {}
+    BlockStats = {}
+    Originals = {}
+    Phases = ["receive", "wait", "execute", "send"]
+    Counts = ["received", "sent", "dispatches"]
+
+    @staticmethod
+    def Enable():
+        if MayaProfiler.Enabled:
+            return
+
+        MayaProfiler.Enabled = True
+        globals()["cmds"] = MayaCmdsProxy(cmds)
+
+        for obj in list(globals().values()):
+            if isinstance(obj, type) and issubclass(obj, block.Block) and obj.__name__.startswith("MayaPy"):
+                MayaProfiler.__instrument(obj)
+
+    @staticmethod
+    def Disable():
+        if not MayaProfiler.Enabled:
+            return
+
+        MayaProfiler.Enabled = False
+        if isinstance(cmds, MayaCmdsProxy):
+            globals()["cmds"] = cmds.module()
+
+        for cls, originals in MayaProfiler.Originals.items():
+            for name, func in originals.items():
+                if func is None:
+                    delattr(cls, name)
+                else:
+                    setattr(cls, name, func)
+
+        MayaProfiler.Originals.clear()
+
+    @staticmethod
+    def Reset():
+        with MayaProfiler.Lock:
+            del MayaProfiler.Events[:]
+            MayaProfiler.CmdsStats.clear()
+            MayaProfiler.BlockStats.clear()
+
+    @staticmethod
+    def __instrument(cls):
+        MayaProfiler.Originals[cls] = dict((name, cls.__dict__.get(name)) for name in ("run", "input", "output"))
+        run = cls.run
+        inp = cls.input
+        oup = cls.output
+
+        def timed_run(self):
+            MayaProfiler.BeginRun(cls.__name__)
+            try:
+                return run(self)
+            finally:
+                MayaProfiler.EndRun()
+
+        def timed_input(self, name):
+            return MayaTimedPort(inp(self, name))
+
+        def timed_output(self, name):
+            return MayaTimedPort(oup(self, name))
+
+        cls.run = timed_run
+        cls.input = timed_input
+        cls.output = timed_output
+
+    @staticmethod
+    def BeginRun(name):
+        record = {"name": name, "start": MayaProfiler.Clock()}
+        for key in MayaProfiler.Phases:
+            record[key] = 0.0
+
+        for key in MayaProfiler.Counts:
+            record[key] = 0
+
+        MayaProfiler.Local.run = record
+
+    @staticmethod
+    def EndRun():
+        record = getattr(MayaProfiler.Local, "run", None)
+        if record is None:
+            return
+
+        MayaProfiler.Local.run = None
+        end = MayaProfiler.Clock()
+        args = dict((k, record[k]) for k in MayaProfiler.Phases + MayaProfiler.Counts)
+        MayaProfiler.AddEvent(record["name"], "run", record["start"], end, threading.current_thread().ident, args)
+
+        with MayaProfiler.Lock:
+            stats = MayaProfiler.BlockStats.setdefault(record["name"], dict((k, 0) for k in ["runs", "total"] + MayaProfiler.Phases + MayaProfiler.Counts))
+            stats["runs"] += 1
+            stats["total"] += end - record["start"]
+            for k, v in args.items():
+                stats[k] += v
+
+    @staticmethod
+    def AddPhase(phase, seconds, countKey=None, count=0):
+        record = getattr(MayaProfiler.Local, "run", None)
+        if record is None:
+            return
+
+        record[phase] += seconds
+        if countKey:
+            record[countKey] += count
+
+    @staticmethod
+    def AddEvent(name, category, start, end, tid, args=None):
+        event = {"name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": tid, "ts": (start - MayaProfiler.Origin) * 1000000.0, "dur": (end - start) * 1000000.0}
+        if args:
+            event["args"] = args
+
+        MayaProfiler.Events.append(event)
+
+    @staticmethod
+    def CountCall(name, seconds):
+        with MayaProfiler.Lock:
+            stats = MayaProfiler.CmdsStats.get(name)
+            if stats is None:
+                stats = [0, 0.0]
+                MayaProfiler.CmdsStats[name] = stats
+
+            stats[0] += 1
+            stats[1] += seconds
+
+    @staticmethod
+    def Execute(func, *args, **kwargs):
+        submitted = MayaProfiler.Clock()
+        marks = []
+
+        def timed(*a, **k):
+            marks.append(MayaProfiler.Clock())
+            try:
+                return func(*a, **k)
+            finally:
+                marks.append(MayaProfiler.Clock())
+                marks.append(threading.current_thread().ident)
+
+        try:
+            return MayaUtil.Dispatch(timed, *args, **kwargs)
+        finally:
+            if len(marks) == 3:
+                start, end, main_tid = marks
+                name = getattr(func, "__name__", "function")
+                MayaProfiler.AddEvent(name, "wait", submitted, start, threading.current_thread().ident)
+                MayaProfiler.AddEvent(name, "execute", start, end, main_tid)
+                MayaProfiler.AddPhase("wait", start - submitted, "dispatches", 1)
+                MayaProfiler.AddPhase("execute", end - start)
+
+    @staticmethod
+    def WriteTrace(path):
+        with MayaProfiler.Lock:
+            events = list(MayaProfiler.Events)
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    @staticmethod
+    def Summary():
+        with MayaProfiler.Lock:
+            block_stats = dict((k, dict(v)) for k, v in MayaProfiler.BlockStats.items())
+            cmds_stats = dict((k, list(v)) for k, v in MayaProfiler.CmdsStats.items())
+
+        lines = ["{:<28}{:>6}{:>11}{:>11}{:>11}{:>11}{:>11}{:>10}{:>10}{:>6}".format("block", "runs", "total(s)", "receive", "wait", "execute", "send", "in", "out", "disp")]
+        for name in sorted(block_stats, key=lambda x: -block_stats[x]["total"]):
+            st = block_stats[name]
+            lines.append("{:<28}{:>6}{:>11.4f}{:>11.4f}{:>11.4f}{:>11.4f}{:>11.4f}{:>10}{:>10}{:>6}".format(name, st["runs"], st["total"], st["receive"], st["wait"], st["execute"], st["send"], st["received"], st["sent"], st["dispatches"]))
+
+        lines.append("")
+        lines.append("{:<28}{:>10}{:>11}{:>11}".format("cmds", "calls", "total(s)", "mean(ms)"))
+        for name in sorted(cmds_stats, key=lambda x: -cmds_stats[x][1]):
+            calls, total = cmds_stats[name]
+            lines.append("{:<28}{:>10}{:>11.4f}{:>11.4f}".format(name, calls, total, total * 1000.0 / calls))
+
+        metrics = MayaDispatcher.Metrics()
+        if metrics["calls"]:
+            lines.append("")
+            lines.append("{:<28}{:>10}{:>10}{:>11}{:>11}{:>11}{:>11}".format("dispatcher", "calls", "batches", "mean size", "max depth", "mean wait", "max wait"))
+            lines.append("{:<28}{:>10}{:>10}{:>11.2f}{:>11}{:>11.4f}{:>11.4f}".format("", metrics["calls"], metrics["batches"], metrics["meanBatch"], metrics["maxDepth"], metrics["meanWait"], metrics["maxWait"]))
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def Dump(path):
+        MayaProfiler.WriteTrace(path)
+        with open(path + ".txt", "w") as f:
+            f.write(MayaProfiler.Summary() + "\n")
+
+
+class MayaDispatchJob(object):
+    def __init__(self, func, args, kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.result = None
+        self.error = None
+        self.submitted = MayaProfiler.Clock()
+        self.done = threading.Event()
+
+
+class MayaDispatcher:
+    Enabled = False
+    Window = 0.001
+    Lock = threading.Lock()
+    Pending = []
+    Leading = False
+    Stats = {}
+
+    @staticmethod
+    def Enable(window=None):
+        if window is not None:
+            MayaDispatcher.Window = window
+
+        MayaDispatcher.Enabled = True
+
+    @staticmethod
+    def Disable():
+        MayaDispatcher.Enabled = False
+
+    @staticmethod
+    def Reset():
+        with MayaDispatcher.Lock:
+            MayaDispatcher.Stats.clear()
+
+    @staticmethod
+    def Metrics():
+        with MayaDispatcher.Lock:
+            stats = dict(MayaDispatcher.Stats)
+
+        calls = stats.get("calls", 0)
+        batches = stats.get("batches", 0)
+        waited = stats.get("waited", 0)
+
+        return {"calls": calls,
+                "batches": batches,
+                "meanBatch": float(calls) / batches if batches else 0.0,
+                "maxDepth": stats.get("maxDepth", 0),
+                "meanDepth": float(stats.get("depth", 0)) / calls if calls else 0.0,
+                "meanWait": stats.get("wait", 0.0) / waited if waited else 0.0,
+                "maxWait": stats.get("maxWait", 0.0)}
+
+    @staticmethod
+    def Submit(func, *args, **kwargs):
+        if threading.current_thread().name == "MainThread":
+            return mayaExts.ExecuteFunction(func, *args, **kwargs)
+
+        job = MayaDispatchJob(func, args, kwargs)
+
+        with MayaDispatcher.Lock:
+            MayaDispatcher.Pending.append(job)
+            depth = len(MayaDispatcher.Pending)
+            stats = MayaDispatcher.Stats
+            stats["calls"] = stats.get("calls", 0) + 1
+            stats["depth"] = stats.get("depth", 0) + depth
+            stats["maxDepth"] = max(stats.get("maxDepth", 0), depth)
+
+            leader = not MayaDispatcher.Leading
+            if leader:
+                MayaDispatcher.Leading = True
+
+        if leader:
+            time.sleep(MayaDispatcher.Window)
+
+            with MayaDispatcher.Lock:
+                batch = MayaDispatcher.Pending[:]
+                del MayaDispatcher.Pending[:]
+                MayaDispatcher.Leading = False
+                MayaDispatcher.Stats["batches"] = MayaDispatcher.Stats.get("batches", 0) + 1
+
+            try:
+                mayaExts.ExecuteFunction(MayaDispatcher.__runBatch, batch)
+            except Exception as e:
+                for j in batch:
+                    if not j.done.is_set():
+                        j.error = e
+                        j.done.set()
+
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+
+        return job.result
+
+    @staticmethod
+    def __runBatch(batch):
+        waits = []
+
+        for job in batch:
+            waits.append(MayaProfiler.Clock() - job.submitted)
+            try:
+                job.result = job.func(*job.args, **job.kwargs)
+            except Exception as e:
+                job.error = e
+            finally:
+                job.done.set()
+
+        with MayaDispatcher.Lock:
+            stats = MayaDispatcher.Stats
+            stats["waited"] = stats.get("waited", 0) + len(waits)
+            stats["wait"] = stats.get("wait", 0.0) + sum(waits)
+            stats["maxWait"] = max([stats.get("maxWait", 0.0)] + waits)
+
+
+class MayaSceneIndex:
+    Dirty = True
+    Callbacks = []
+    DagPaths = {}
+    PartialPaths = {}
+    Children = {}
+    NodeNames = {}
+    NodeTypes = {}
+    Connections = {}
+    Plugs = {}
+    Edges = set()
+    DerivedTypes = {}
+
+    @staticmethod
+    def Ensure():
+        if not MayaSceneIndex.Callbacks:
+            MayaSceneIndex.Callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, MayaSceneIndex.__onDirty))
+            MayaSceneIndex.Callbacks.append(om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, MayaSceneIndex.__onDirty))
+            MayaSceneIndex.Callbacks.append(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, MayaSceneIndex.__onDirty))
+            MayaSceneIndex.Callbacks.append(om.MDagMessage.addParentAddedCallback(MayaSceneIndex.__onDirty))
+            MayaSceneIndex.Callbacks.append(om.MDagMessage.addParentRemovedCallback(MayaSceneIndex.__onDirty))
+            MayaSceneIndex.Callbacks.append(om.MDGMessage.addNodeAddedCallback(MayaSceneIndex.__onNodeAdded, "dependNode"))
+            MayaSceneIndex.Callbacks.append(om.MDGMessage.addNodeRemovedCallback(MayaSceneIndex.__onNodeRemoved, "dependNode"))
+            MayaSceneIndex.Callbacks.append(om.MDGMessage.addConnectionCallback(MayaSceneIndex.__onConnection))
+            MayaSceneIndex.Dirty = True
+
+        if MayaSceneIndex.Dirty:
+            MayaSceneIndex.Build()
+
+    @staticmethod
+    def Release():
+        if MayaSceneIndex.Callbacks:
+            om.MMessage.removeCallbacks(MayaSceneIndex.Callbacks)
+
+        del MayaSceneIndex.Callbacks[:]
+        MayaSceneIndex.Clear()
+        MayaSceneIndex.Dirty = True
+
+    @staticmethod
+    def Clear():
+        MayaSceneIndex.DagPaths.clear()
+        MayaSceneIndex.PartialPaths.clear()
+        MayaSceneIndex.Children.clear()
+        MayaSceneIndex.NodeNames.clear()
+        MayaSceneIndex.NodeTypes.clear()
+        MayaSceneIndex.Connections.clear()
+        MayaSceneIndex.Plugs.clear()
+        MayaSceneIndex.Edges.clear()
+        MayaSceneIndex.DerivedTypes.clear()
+
+    @staticmethod
+    def Build():
+        MayaSceneIndex.Clear()
+
+        it = om.MItDag()
+        while not it.isDone():
+            path = it.getPath()
+            full = path.fullPathName()
+            if full:
+                partial = path.partialPathName()
+                MayaSceneIndex.DagPaths[full] = full
+                MayaSceneIndex.DagPaths.setdefault(partial, full)
+                MayaSceneIndex.PartialPaths[full] = partial
+                MayaSceneIndex.Children.setdefault(full, [])
+
+                parent = full.rpartition("|")[0]
+                if parent:
+                    MayaSceneIndex.Children.setdefault(parent, []).append(full)
+
+            it.next()
+
+        it = om.MItDependencyNodes()
+        while not it.isDone():
+            MayaSceneIndex.__addNode(it.thisNode())
+            it.next()
+
+        it.reset()
+        while not it.isDone():
+            for plug in om.MFnDependencyNode(it.thisNode()).getConnections():
+                for src in plug.connectedTo(True, False):
+                    MayaSceneIndex.__addEdge(src, plug)
+
+            it.next()
+
+        MayaSceneIndex.Dirty = False
+
+    @staticmethod
+    def ListChildren(name, fullPath):
+        full = MayaSceneIndex.DagPaths.get(name)
+        if full is None:
+            return None
+
+        children = MayaSceneIndex.Children.get(full, [])
+        if fullPath:
+            return list(children)
+
+        return [MayaSceneIndex.PartialPaths[c] for c in children]
+
+    @staticmethod
+    def ListParents(name, fullPath):
+        full = MayaSceneIndex.DagPaths.get(name)
+        if full is None:
+            return None
+
+        parent = full.rpartition("|")[0]
+        if not parent:
+            return []
 
+        if fullPath:
+            return [parent]
 
-class MayaUtil:
-    Numeric = ["bool", "doubleLinear", "doubleAngle", "double", "long", "short", "byte", "enum", "float"]
-    String = ["string"]
+        return [MayaSceneIndex.PartialPaths[parent]]
 
     @staticmethod
-    def IsNumeric(typeName):
-        return typeName in MayaUtil.Numeric
+    def ListConnections(name, source, destination, nodeType):
+        node = MayaSceneIndex.NodeNames.get(name)
+        if node is None:
+            return None
+
+        allowed = None
+        if nodeType:
+            allowed = MayaSceneIndex.DerivedTypes.get(nodeType)
+            if allowed is None:
+                allowed = set(cmds.nodeType(nodeType, derived=True, isTypeName=True) or [nodeType])
+                MayaSceneIndex.DerivedTypes[nodeType] = allowed
+
+        results = []
+        edges = MayaSceneIndex.Connections.get(node, [])
+
+        if source:
+            for local, remote, remote_node, is_dst in edges:
+                if is_dst and (allowed is None or MayaSceneIndex.NodeTypes.get(remote_node) in allowed):
+                    results.append((remote, local))
+
+        if destination:
+            for local, remote, remote_node, is_dst in edges:
+                if not is_dst and (allowed is None or MayaSceneIndex.NodeTypes.get(remote_node) in allowed):
+                    results.append((local, remote))
+
+        return results
 
     @staticmethod
-    def IsString(typeName):
-        return typeName in MayaUtil.String
+    def IsConnected(src, dst):
+        return (MayaSceneIndex.Plugs.get(src), MayaSceneIndex.Plugs.get(dst)) in MayaSceneIndex.Edges
+
+    @staticmethod
+    def NodeName(node):
+        if node.hasFn(om.MFn.kDagNode):
+            return om.MDagPath.getAPathTo(node).partialPathName()
+
+        return om.MFnDependencyNode(node).name()
+
+    @staticmethod
+    def PlugName(plug):
+        return "{}.{}".format(MayaSceneIndex.NodeName(plug.node()), plug.partialName(includeNonMandatoryIndices=True, useLongNames=True))
+
+    @staticmethod
+    def __nodeAliases(node):
+        names = [MayaSceneIndex.NodeName(node)]
+        if node.hasFn(om.MFn.kDagNode):
+            names += [p.fullPathName() for p in om.MDagPath.getAllPathsTo(node)]
+
+        return names
+
+    @staticmethod
+    def __addNode(node):
+        aliases = MayaSceneIndex.__nodeAliases(node)
+        name = aliases[0]
+
+        for alias in aliases:
+            MayaSceneIndex.NodeNames[alias] = name
+
+        MayaSceneIndex.NodeTypes[name] = om.MFnDependencyNode(node).typeName
+
+    @staticmethod
+    def __addEdge(src, dst):
+        src_name = MayaSceneIndex.PlugName(src)
+        dst_name = MayaSceneIndex.PlugName(dst)
+
+        if (src_name, dst_name) in MayaSceneIndex.Edges:
+            return
+
+        src_node = MayaSceneIndex.NodeName(src.node())
+        dst_node = MayaSceneIndex.NodeName(dst.node())
+
+        MayaSceneIndex.Edges.add((src_name, dst_name))
+        MayaSceneIndex.Connections.setdefault(src_node, []).append((src_name, dst_name, dst_node, False))
+        MayaSceneIndex.Connections.setdefault(dst_node, []).append((dst_name, src_name, src_node, True))
+
+        for plug, name in ((src, src_name), (dst, dst_name)):
+            attrs = set([plug.partialName(includeNonMandatoryIndices=True, useLongNames=True), plug.partialName(includeNonMandatoryIndices=True)])
+            for node in MayaSceneIndex.__nodeAliases(plug.node()):
+                for attr in attrs:
+                    MayaSceneIndex.Plugs["{}.{}".format(node, attr)] = name
+
+    @staticmethod
+    def __removeEdge(src, dst):
+        src_name = MayaSceneIndex.PlugName(src)
+        dst_name = MayaSceneIndex.PlugName(dst)
+
+        if (src_name, dst_name) not in MayaSceneIndex.Edges:
+            return
+
+        MayaSceneIndex.Edges.discard((src_name, dst_name))
+
+        src_node = MayaSceneIndex.NodeName(src.node())
+        dst_node = MayaSceneIndex.NodeName(dst.node())
+
+        MayaSceneIndex.Connections[src_node] = [x for x in MayaSceneIndex.Connections.get(src_node, []) if x[:2] != (src_name, dst_name) or x[3]]
+        MayaSceneIndex.Connections[dst_node] = [x for x in MayaSceneIndex.Connections.get(dst_node, []) if x[:2] != (dst_name, src_name) or not x[3]]
+
+    @staticmethod
+    def __onDirty(*args):
+        MayaSceneIndex.Dirty = True
+
+    @staticmethod
+    def __onNodeAdded(node, *args):
+        if MayaSceneIndex.Dirty:
+            return
+
+        if node.hasFn(om.MFn.kDagNode):
+            MayaSceneIndex.Dirty = True
+            return
+
+        MayaSceneIndex.__addNode(node)
+
+    @staticmethod
+    def __onNodeRemoved(node, *args):
+        if MayaSceneIndex.Dirty:
+            return
+
+        if node.hasFn(om.MFn.kDagNode):
+            MayaSceneIndex.Dirty = True
+            return
+
+        name = MayaSceneIndex.NodeName(node)
+        MayaSceneIndex.NodeNames.pop(name, None)
+        MayaSceneIndex.NodeTypes.pop(name, None)
+        MayaSceneIndex.Connections.pop(name, None)
+
+    @staticmethod
+    def __onConnection(src, dst, made, *args):
+        if MayaSceneIndex.Dirty:
+            return
+
+        if made:
+            MayaSceneIndex.__addEdge(src, dst)
+        else:
+            MayaSceneIndex.__removeEdge(src, dst)
+
+
+class MayaReplayPacket(object):
+    def __init__(self, value, eop=False):
+        self.__value = value
+        self.__eop = eop
+
+    def isEOP(self):
+        return self.__eop
+
+    def value(self):
+        return self.__value
+
+    def drop(self):
+        pass
+
+
+class MayaReplayPort(object):
+    def __init__(self, values):
+        self.__values = values
+        self.__index = 0
+
+    def receive(self, *args, **kwargs):
+        if self.__index >= len(self.__values):
+            return MayaReplayPacket(None, eop=True)
+
+        self.__index += 1
+
+        return MayaReplayPacket(self.__values[self.__index - 1])
+
+
+class MayaRecordPort(object):
+    def __init__(self, port, budget):
+        self.__port = port
+        self.__budget = budget
+        self.__values = []
+
+    def values(self):
+        return self.__values
+
+    def send(self, value, *args, **kwargs):
+        r = self.__port.send(value, *args, **kwargs)
+        if r and self.__budget[0] > 0:
+            self.__values.append(value)
+            self.__budget[0] -= 1
+        elif r:
+            self.__budget[0] = -1
+            self.__values = []
+
+        return r
+
+
+class MayaSceneMemo:
+    Revision = 0
+    MaxItems = 1000000
+    Items = 0
+    Callbacks = []
+    Entries = OrderedDict()
+    Lock = threading.Lock()
+    StructureCommands = set(["addAttr", "deleteAttr", "renameAttr"])
+    StaticLsFlags = set(["long", "l", "shortNames", "sn", "type", "typ", "exactType", "et", "excludeType", "ext", "dag", "d",
+                         "dependencyNodes", "dep", "transforms", "tr", "shapes", "s", "geometry", "g", "materials", "mat",
+                         "textures", "tex", "lights", "lt", "cameras", "ca", "assemblies", "allPaths", "ap", "noIntermediate", "ni",
+                         "intermediateObjects", "io", "referencedNodes", "rn", "showType", "st", "showNamespace", "sns",
+                         "uuid", "absoluteName", "an", "recursive", "r", "objectsOnly", "o", "nodeTypes", "nt"])
+
+    @staticmethod
+    def IsStatic(kwargs, flags):
+        return not [k for k, v in kwargs.items() if v is not False and v is not None and k not in flags]
+
+    @staticmethod
+    def Ensure():
+        if not MayaSceneMemo.Callbacks:
+            MayaUtil.Execute(MayaSceneMemo.__install)
+
+    @staticmethod
+    def Release():
+        if MayaSceneMemo.Callbacks:
+            om.MMessage.removeCallbacks(MayaSceneMemo.Callbacks)
+
+        del MayaSceneMemo.Callbacks[:]
+        MayaSceneMemo.Clear()
+
+    @staticmethod
+    def Clear():
+        with MayaSceneMemo.Lock:
+            MayaSceneMemo.Entries.clear()
+            MayaSceneMemo.Items = 0
+
+    @staticmethod
+    def __install():
+        if MayaSceneMemo.Callbacks:
+            return
+
+        for msg in (om.MSceneMessage.kAfterOpen, om.MSceneMessage.kAfterNew, om.MSceneMessage.kAfterImport,
+                    om.MSceneMessage.kAfterLoadReference, om.MSceneMessage.kAfterUnloadReference, om.MSceneMessage.kAfterRemoveReference):
+            MayaSceneMemo.Callbacks.append(om.MSceneMessage.addCallback(msg, MayaSceneMemo.__onChanged))
+
+        MayaSceneMemo.Callbacks.append(om.MDGMessage.addNodeAddedCallback(MayaSceneMemo.__onChanged, "dependNode"))
+        MayaSceneMemo.Callbacks.append(om.MDGMessage.addNodeRemovedCallback(MayaSceneMemo.__onChanged, "dependNode"))
+        MayaSceneMemo.Callbacks.append(om.MDGMessage.addConnectionCallback(MayaSceneMemo.__onChanged))
+        MayaSceneMemo.Callbacks.append(om.MNodeMessage.addNameChangedCallback(om.MObject.kNullObj, MayaSceneMemo.__onChanged))
+        MayaSceneMemo.Callbacks.append(om.MDagMessage.addParentAddedCallback(MayaSceneMemo.__onChanged))
+        MayaSceneMemo.Callbacks.append(om.MDagMessage.addParentRemovedCallback(MayaSceneMemo.__onChanged))
+        MayaSceneMemo.Callbacks.append(om.MEventMessage.addEventCallback("Undo", MayaSceneMemo.__onChanged))
+        MayaSceneMemo.Callbacks.append(om.MEventMessage.addEventCallback("Redo", MayaSceneMemo.__onChanged))
+        MayaSceneMemo.Callbacks.append(om.MCommandMessage.addCommandCallback(MayaSceneMemo.__onCommand))
+        MayaSceneMemo.Revision += 1
+
+    @staticmethod
+    def __onChanged(*args):
+        MayaSceneMemo.Revision += 1
+
+    @staticmethod
+    def __onCommand(command, *args):
+        if command.split(" ", 1)[0] in MayaSceneMemo.StructureCommands:
+            MayaSceneMemo.Revision += 1
+
+    @staticmethod
+    def Run(blk, inputs, outputs, params, process, static=True):
+        if not static or not blk.param("memoize").get():
+            process()
+            return
+
+        MayaSceneMemo.Ensure()
+        revision = MayaSceneMemo.Revision
+
+        values = dict((name, list(itertools.chain.from_iterable(MayaUtil.ReceiveChunks(blk.input(name), 0)))) for name in inputs)
+        key = (blk.__class__.__name__, tuple(blk.param(name).get() for name in params), tuple(tuple(values[name]) for name in inputs))
+
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+
+        entry = None
+        if key is not None:
+            with MayaSceneMemo.Lock:
+                entry = MayaSceneMemo.Entries.pop(key, None)
+                if entry is not None and entry[0] == revision:
+                    MayaSceneMemo.Entries[key] = entry
+                elif entry is not None:
+                    MayaSceneMemo.Items -= entry[2]
+                    entry = None
+
+        if entry is not None:
+            for name in outputs:
+                oup = blk.output(name)
+                for v in entry[1][name]:
+                    oup.send(v)
+
+            return
+
+        in_ports = dict((name, MayaReplayPort(values[name])) for name in inputs)
+        budget = [MayaSceneMemo.MaxItems]
+        out_ports = dict((name, MayaRecordPort(blk.output(name), budget)) for name in outputs)
+
+        blk.input = lambda name: in_ports[name]
+        blk.output = lambda name: out_ports[name]
+        try:
+            process()
+        finally:
+            del blk.input
+            del blk.output
+
+        if key is None or budget[0] < 0 or MayaSceneMemo.Revision != revision:
+            return
+
+        items = MayaSceneMemo.MaxItems - budget[0]
+
+        with MayaSceneMemo.Lock:
+            old = MayaSceneMemo.Entries.pop(key, None)
+            if old is not None:
+                MayaSceneMemo.Items -= old[2]
+
+            MayaSceneMemo.Entries[key] = (revision, dict((name, port.values()) for name, port in out_ports.items()), items)
+            MayaSceneMemo.Items += items
+            while MayaSceneMemo.Items > MayaSceneMemo.MaxItems:
+                MayaSceneMemo.Items -= MayaSceneMemo.Entries.popitem(last=False)[1][2]
+
+
+class MayaBulkWrite(object):
+    Depth = 0
+    State = {}
+
+    def __init__(self, disableUndo=False):
+        self.__disable_undo = disableUndo
+
+    @staticmethod
+    def Call(disableUndo, func, *args, **kwargs):
+        with MayaBulkWrite(disableUndo):
+            return func(*args, **kwargs)
+
+    def __enter__(self):
+        MayaBulkWrite.Depth += 1
+        if MayaBulkWrite.Depth > 1:
+            return self
+
+        state = MayaBulkWrite.State
+        state.clear()
+
+        try:
+            if self.__disable_undo:
+                state["undo"] = cmds.undoInfo(query=True, state=True)
+                cmds.undoInfo(stateWithoutFlush=False)
+            else:
+                cmds.undoInfo(openChunk=True)
+                state["chunk"] = True
+
+            if not cmds.about(batch=True):
+                cmds.refresh(suspend=True)
+                state["refresh"] = True
+
+            try:
+                mode = cmds.evaluationManager(query=True, mode=True)
+            except:
+                mode = None
+
+            if mode and mode[0] != "off":
+                cmds.evaluationManager(mode="off")
+                state["evaluation"] = mode[0]
+        except:
+            self.__exit__(None, None, None)
+            raise
+
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        MayaBulkWrite.Depth -= 1
+        if MayaBulkWrite.Depth > 0:
+            return False
+
+        state = MayaBulkWrite.State
+
+        try:
+            if "evaluation" in state:
+                cmds.evaluationManager(mode=state["evaluation"])
+        finally:
+            try:
+                if state.get("refresh"):
+                    cmds.refresh(suspend=False)
+            finally:
+                try:
+                    if state.get("chunk"):
+                        cmds.undoInfo(closeChunk=True)
+
+                    if "undo" in state:
+                        cmds.undoInfo(stateWithoutFlush=state["undo"])
+                finally:
+                    state.clear()
+
+        return False
+
+
+class MayaWorkerPool:
+    Prefix = "#pbDCCPacks# "
+    Source = r"""
+import json
+import sys
+
+prefix = sys.argv[1]
+header = json.loads(sys.stdin.readline())
+cmds = None
+
+if not header.get("standIn"):
+    import maya.standalone
+    maya.standalone.initialize(name="python")
+    from maya import cmds
+
+
+def reply(message):
+    sys.stdout.write(prefix + json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+for line in iter(sys.stdin.readline, ""):
+    job = json.loads(line)
+
+    try:
+        if cmds is None:
+            nodes = [job["file"]]
+        else:
+            cmds.file(job["file"], open=True, force=True)
+            args = (header["pattern"], ) if header.get("pattern") else ()
+            kwargs = {"type": header["type"]} if header.get("type") else {}
+            nodes = cmds.ls(*args, **kwargs) or []
+
+        for n in nodes:
+            reply({"id": job["id"], "node": n})
+
+        reply({"id": job["id"], "done": True})
+    except Exception as e:
+        reply({"id": job["id"], "done": True, "error": str(e)})
+"""
+
+    def __init__(self, executable, workers, header):
+        self.__executable = executable
+        self.__workers = workers if workers > 0 else multiprocessing.cpu_count()
+        self.__header = header
+        self.__cond = threading.Condition()
+        self.__results = []
+        self.__finished = set()
+        self.__errors = {}
+
+    def errors(self):
+        return self.__errors
+
+    def run(self, files):
+        jobs = queue.Queue()
+        self.__results = [[] for _ in files]
+        self.__finished = set()
+        self.__errors = {}
+
+        for i, f in enumerate(files):
+            jobs.put((i, f))
+
+        for _ in range(min(self.__workers, len(files))):
+            t = threading.Thread(target=self.__work, args=(jobs, ))
+            t.daemon = True
+            t.start()
+
+        for i, f in enumerate(files):
+            sent = 0
+
+            while (True):
+                with self.__cond:
+                    while len(self.__results[i]) == sent and i not in self.__finished:
+                        self.__cond.wait()
+
+                    nodes = self.__results[i][sent:]
+                    complete = i in self.__finished
+
+                for n in nodes:
+                    yield (f, n)
+
+                sent += len(nodes)
+                if complete:
+                    break
+
+            self.__results[i] = None
+
+    def __spawn(self):
+        proc = subprocess.Popen([self.__executable, "-c", MayaWorkerPool.Source, MayaWorkerPool.Prefix], stdin=subprocess.PIPE, stdout=subprocess.PIPE, universal_newlines=True)
+        proc.stdin.write(json.dumps(self.__header) + "\n")
+        proc.stdin.flush()
+
+        return proc
+
+    def __request(self, proc, jobId, filePath):
+        proc.stdin.write(json.dumps({"id": jobId, "file": filePath}) + "\n")
+        proc.stdin.flush()
+
+        while (True):
+            line = proc.stdout.readline()
+            if not line:
+                raise RuntimeError("Worker exited while processing '{}'".format(filePath))
+
+            if not line.startswith(MayaWorkerPool.Prefix):
+                continue
+
+            message = json.loads(line[len(MayaWorkerPool.Prefix):])
+
+            with self.__cond:
+                if message.get("done"):
+                    if message.get("error"):
+                        self.__errors[jobId] = message["error"]
+
+                    self.__finished.add(jobId)
+                    self.__cond.notify_all()
+                    return
+
+                self.__results[jobId].append(message["node"])
+                self.__cond.notify_all()
+
+    def __work(self, jobs):
+        proc = None
+
+        while (True):
+            try:
+                job_id, file_path = jobs.get_nowait()
+            except queue.Empty:
+                break
+
+            try:
+                if proc is None:
+                    proc = self.__spawn()
+
+                self.__request(proc, job_id, file_path)
+            except Exception as e:
+                with self.__cond:
+                    self.__errors[job_id] = str(e)
+                    self.__finished.add(job_id)
+                    self.__cond.notify_all()
+
+                if proc is not None:
+                    proc.kill()
+                    proc.wait()
+                    proc = None
+
+        if proc is not None:
+            proc.stdin.close()
+            proc.wait()
+
+
+class MayaAuditTable(object):
+    Version = 1
+    Columns = ["node", "attr", "type"]
+    CodeType = "i"
+    MetaFile = "meta.json"
+    ValueFile = "value.f64"
+
+    def __init__(self, path):
+        self.__path = path
+        self.__rows = 0
+        self.__chunks = []
+        self.__dicts = {}
+        self.__files = {}
+        self.__maps = {}
+        self.__byteorder = sys.byteorder
+
+    def path(self):
+        return self.__path
+
+    def rows(self):
+        return self.__rows
+
+    def __file(self, name):
+        return os.path.join(self.__path, name)
+
+    @staticmethod
+    def __toBytes(arr):
+        return arr.tobytes() if hasattr(arr, "tobytes") else arr.tostring()
+
+    @staticmethod
+    def __fromBytes(arr, data):
+        if hasattr(arr, "frombytes"):
+            arr.frombytes(data)
+        else:
+            arr.fromstring(data)
+
+        return arr
+
+    def create(self):
+        if not os.path.isdir(self.__path):
+            os.makedirs(self.__path)
+
+        meta = self.__file(MayaAuditTable.MetaFile)
+        if os.path.isfile(meta):
+            os.remove(meta)
+
+        for col in MayaAuditTable.Columns:
+            self.__dicts[col] = {}
+            self.__files[col + ".dict"] = open(self.__file(col + ".dict"), "wb")
+            self.__files[col + ".i32"] = open(self.__file(col + ".i32"), "wb")
+
+        self.__files[MayaAuditTable.ValueFile] = open(self.__file(MayaAuditTable.ValueFile), "wb")
+
+    def write(self, rows):
+        for index, col in enumerate(MayaAuditTable.Columns):
+            codes = array(MayaAuditTable.CodeType)
+            strings = self.__dicts[col]
+            new_strings = []
+
+            for row in rows:
+                key = row[index]
+                code = strings.get(key)
+                if code is None:
+                    code = len(strings)
+                    strings[key] = code
+                    new_strings.append(key)
+
+                codes.append(code)
+
+            if new_strings:
+                self.__files[col + ".dict"].write("".join(x + "\n" for x in new_strings).encode("utf-8"))
+
+            self.__files[col + ".i32"].write(MayaAuditTable.__toBytes(codes))
+
+        values = array("d", (v if isinstance(v, Number) else float("nan") for v in (row[-1] for row in rows)))
+        self.__files[MayaAuditTable.ValueFile].write(MayaAuditTable.__toBytes(values))
+
+        self.__rows += len(rows)
+        self.__chunks.append(len(rows))
+
+    def close(self, commit=False):
+        if self.__files:
+            for f in self.__files.values():
+                f.close()
+
+            self.__files = {}
+
+            if commit:
+                with open(self.__file(MayaAuditTable.MetaFile), "w") as f:
+                    json.dump({"version": MayaAuditTable.Version,
+                               "columns": MayaAuditTable.Columns + ["value"],
+                               "rows": self.__rows,
+                               "chunks": self.__chunks,
+                               "byteorder": self.__byteorder}, f)
+
+        for mm, f in self.__maps.values():
+            mm.close()
+            f.close()
+
+        self.__maps = {}
+
+    def open(self):
+        with open(self.__file(MayaAuditTable.MetaFile)) as f:
+            meta = json.load(f)
+
+        if meta.get("version") != MayaAuditTable.Version:
+            raise Exception("Unsupported audit table version '{}'".format(meta.get("version")))
+
+        self.__rows = meta["rows"]
+        self.__chunks = meta["chunks"]
+        self.__byteorder = meta["byteorder"]
+
+        for col in MayaAuditTable.Columns:
+            with open(self.__file(col + ".dict"), "rb") as f:
+                self.__dicts[col] = f.read().decode("utf-8").split("\n")[:-1]
+
+        if self.__rows == 0:
+            return
+
+        for name in [col + ".i32" for col in MayaAuditTable.Columns] + [MayaAuditTable.ValueFile]:
+            f = open(self.__file(name), "rb")
+            self.__maps[name] = (mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), f)
+
+    def __column(self, name, typeCode, start, end):
+        arr = array(typeCode)
+        mm = self.__maps[name][0]
+        self.__fromBytes(arr, mm[start * arr.itemsize:end * arr.itemsize])
+        if self.__byteorder != sys.byteorder:
+            arr.byteswap()
+
+        return arr
+
+    def read(self, chunkSize):
+        step = chunkSize if chunkSize > 0 else max(self.__rows, 1)
+
+        for start in range(0, self.__rows, step):
+            end = min(start + step, self.__rows)
+            columns = []
+
+            for col in MayaAuditTable.Columns:
+                strings = self.__dicts[col]
+                columns.append([strings[c] for c in self.__column(col + ".i32", MayaAuditTable.CodeType, start, end)])
+
+            columns.append(self.__column(MayaAuditTable.ValueFile, "d", start, end))
+
+            yield columns
 
 
 class MayaPyFileOpen(block.Block):
+    WarmScene = None
+
     def __init__(self):
         super(MayaPyFileOpen, self).__init__()
 
     def initialize(self):
         self.addParam(str, "file")
+        self.addParam(bool, "forceReload", False)
         self.addOutput(str, "node")
 
+    def __sceneKey(self, filePath):
+        try:
+            st = os.stat(filePath)
+        except OSError:
+            return None
+
+        return (os.path.normcase(os.path.abspath(filePath)), st.st_mtime, st.st_size)
+
+    def __isWarm(self, key):
+        warm = MayaPyFileOpen.WarmScene
+        if key is None or warm is None or warm[0] != key:
+            return False
+
+        if cmds.file(q=True, modified=True):
+            return False
+
+        current = cmds.file(q=True, sceneName=True)
+
+        return bool(current) and os.path.normcase(os.path.abspath(current)) == key[0]
+
     def __run(self, *args, **kwargs):
-        return cmds.file(args[0], **kwargs)
+        force = kwargs.pop("forceReload", False)
+        key = self.__sceneKey(args[0])
+
+        if not force and self.__isWarm(key):
+            return list(MayaPyFileOpen.WarmScene[1])
+
+        MayaPyFileOpen.WarmScene = None
+        new_nodes = cmds.file(args[0], **kwargs) or []
+
+        if key is not None:
+            MayaPyFileOpen.WarmScene = (key, list(new_nodes))
+
+        return new_nodes
 
     def run(self):
-        new_nodes = mayaExts.ExecuteFunction(self.__run, *(self.param("file").get(), ), open=True, force=True, returnNewNodes=True)
+        new_nodes = MayaUtil.Execute(self.__run, *(self.param("file").get(), ), open=True, force=True, returnNewNodes=True, forceReload=self.param("forceReload").get())
 
         oup = self.output("node")
 
@@ -37,6 +1924,44 @@ class MayaPyFileOpen(block.Block):
             oup.send(n)
 
 
+class MayaPyBatchFileLs(block.Block):
+    def __init__(self):
+        super(MayaPyBatchFileLs, self).__init__()
+
+    def initialize(self):
+        self.addInput(str, "file")
+        self.addOutput(str, "scene")
+        self.addOutput(str, "node")
+        self.addParam(str, "pattern")
+        self.addParam(str, "type")
+        self.addParam(int, "workers", 0)
+        self.addParam(str, "mayapy", "mayapy")
+        self.addParam(bool, "standIn", False)
+
+    def run(self):
+        files = []
+        for chunk in MayaUtil.ReceiveChunks(self.input("file"), 0):
+            files += chunk
+
+        header = {"pattern": self.param("pattern").get(), "type": self.param("type").get(), "standIn": self.param("standIn").get()}
+        executable = self.param("mayapy").get()
+        if not executable and header["standIn"]:
+            executable = sys.executable
+
+        pool = MayaWorkerPool(executable, self.param("workers").get(), header)
+
+        out_scene = self.output("scene")
+        out_node = self.output("node")
+
+        for scene, node in pool.run(files):
+            out_scene.send(scene)
+            out_node.send(node)
+
+        errors = pool.errors()
+        for i in sorted(errors):
+            self.warn("Failed to process '{}' : {}".format(files[i], errors[i]))
+
+
 class MayaPyFileImport(block.Block):
     def __init__(self):
         super(MayaPyFileImport, self).__init__()
@@ -45,7 +1970,10 @@ class MayaPyFileImport(block.Block):
         self.addInput(str, "file")
         self.addInput(str, "namespace")
         self.addOutput(str, "node")
+        self.addOutput(str, "timingFile")
+        self.addOutput(float, "timing")
         self.addParam(bool, "reference")
+        self.addParam(bool, "usePlanner", False)
 
     def __run(self, *args, **kwargs):
         new_nodes = []
@@ -55,8 +1983,114 @@ class MayaPyFileImport(block.Block):
             if ns:
                 option["namespace"] = ns
 
-            results = cmds.file(file_path, **option) or []
-            new_nodes += results
+            results = cmds.file(file_path, **option) or []
+            new_nodes += results
+
+        return new_nodes
+
+    def __runPlanned(self, *args, **kwargs):
+        file_ns_list = args[0]
+        results = [[] for _ in file_ns_list]
+        groups = {}
+        files = []
+        timings = {}
+
+        for i, (file_path, ns) in enumerate(file_ns_list):
+            if file_path not in groups:
+                groups[file_path] = []
+                files.append(file_path)
+
+            groups[file_path].append(i)
+
+        for file_path in files:
+            start = time.time()
+            first = groups[file_path][0]
+            first_ns = file_ns_list[first][1]
+            results[first] = self.__run([(file_path, first_ns)], **kwargs)
+
+            for i in groups[file_path][1:]:
+                ns = file_ns_list[i][1]
+                dup_nodes = self.__duplicate(results[first], first_ns, ns)
+                if dup_nodes is None:
+                    dup_nodes = self.__run([(file_path, ns)], **kwargs)
+
+                results[i] = dup_nodes
+
+            timings[file_path] = time.time() - start
+
+        new_nodes = []
+        for r in results:
+            new_nodes += r
+
+        return (new_nodes, [(f, timings[f]) for f in files])
+
+    def __shadingNetwork(self, nodes):
+        sgs = cmds.ls(nodes, type="shadingEngine") or []
+        if not sgs:
+            return set()
+
+        network = set(sgs)
+        network.update(cmds.listConnections(sgs, type="materialInfo") or [])
+
+        shaders = cmds.listConnections(["{}.{}".format(sg, a) for sg in sgs for a in ("surfaceShader", "volumeShader", "displacementShader")], source=True, destination=False) or []
+        if shaders:
+            network.update(cmds.ls(cmds.listHistory(shaders) or [], long=True) or [])
+
+        return network
+
+    def __duplicate(self, nodes, srcNamespace, dstNamespace):
+        src_ns = (srcNamespace or "").lstrip(":")
+        dst_ns = (dstNamespace or "").lstrip(":")
+        if not nodes or not src_ns or not dst_ns or src_ns == dst_ns:
+            return None
+
+        all_nodes = set(cmds.ls(nodes, long=True) or [])
+        dag_nodes = set(cmds.ls(nodes, dag=True, long=True) or [])
+        if not dag_nodes or all_nodes - dag_nodes - self.__shadingNetwork(nodes):
+            return None
+
+        if cmds.ls(nodes, referencedNodes=True):
+            return None
+
+        assignments = {}
+        for shape in cmds.ls(list(dag_nodes), shapes=True, long=True) or []:
+            sgs = list(set(cmds.listConnections(shape, type="shadingEngine") or []))
+            if len(sgs) > 1:
+                return None
+
+            if sgs:
+                assignments[shape] = sgs[0]
+
+        if not cmds.namespace(exists=":" + dst_ns):
+            cmds.namespace(add=":" + dst_ns)
+
+        prefix = src_ns + ":"
+        new_nodes = []
+
+        for root in cmds.ls(nodes, assemblies=True, long=True) or []:
+            dup_root = cmds.ls(cmds.duplicate(root)[0], long=True)[0]
+            src_nodes = [root] + (cmds.listRelatives(root, allDescendents=True, fullPath=True) or [])
+            dup_paths = [dup_root] + (cmds.listRelatives(dup_root, allDescendents=True, fullPath=True) or [])
+
+            sel = om.MSelectionList()
+            for n in dup_paths:
+                sel.add(n)
+
+            dup_objs = [sel.getDependNode(i) for i in range(sel.length())]
+
+            for src, obj in zip(src_nodes, dup_objs):
+                leaf = src.rpartition("|")[2]
+                if leaf.startswith(prefix):
+                    leaf = leaf[len(prefix):]
+
+                om.MFnDependencyNode(obj).setName("{}:{}".format(dst_ns, leaf))
+
+            dup_nodes = [om.MDagPath.getAPathTo(obj).fullPathName() for obj in dup_objs]
+            for src, dup in zip(src_nodes, dup_nodes):
+                if src in assignments:
+                    cmds.sets(dup, edit=True, forceElement=assignments[src])
+
+            new_nodes += dup_nodes
 
         return new_nodes
 
@@ -95,13 +2129,29 @@ class MayaPyFileImport(block.Block):
 
         options["returnNewNodes"] = True
 
-        new_nodes = mayaExts.ExecuteFunction(self.__run, *(file_ns_list, ), **options)
+        timings = []
+        use_planner = self.param("usePlanner").get()
+        if use_planner and options.get("reference"):
+            self.warn("usePlanner only applies to imports, references are created one by one")
+            use_planner = False
+
+        if use_planner:
+            new_nodes, timings = MayaUtil.Execute(self.__runPlanned, *(file_ns_list, ), **options)
+        else:
+            new_nodes = MayaUtil.Execute(self.__run, *(file_ns_list, ), **options)
 
         oup = self.output("node")
 
         for n in new_nodes:
             oup.send(n)
 
+        out_file = self.output("timingFile")
+        out_time = self.output("timing")
+
+        for file_path, seconds in timings:
+            out_file.send(file_path)
+            out_time.send(seconds)
+
 
 class MayaPyLs(block.Block):
     def __init__(self):
@@ -111,12 +2161,72 @@ class MayaPyLs(block.Block):
         self.addParam(str, "pattern")
         self.addParam(str, "type")
         self.addParam(str, "optionDict")
+        self.addParam(bool, "useApi", False)
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(int, "limit", 0)
         self.addOutput(str, "result")
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         return cmds.ls(*args, **kwargs)
 
+    def __iterate(self, *args, **kwargs):
+        MayaUtil.WatchNodes()
+
+        return (MayaUtil.IterNodes(*args), MayaUtil.NodeRevision)
+
+    def __page(self, *args, **kwargs):
+        nodes, revision, count = args
+
+        if MayaUtil.NodeRevision != revision:
+            return None
+
+        if count > 0:
+            return list(itertools.islice(nodes, count))
+
+        return list(nodes)
+
+    def __runApi(self, pattern, nodeType):
+        out = self.output("result")
+        limit = self.param("limit").get()
+        page_size = self.param("chunkSize").get()
+        nodes, revision = MayaUtil.Execute(self.__iterate, *(pattern, nodeType))
+        sent = 0
+
+        while (True):
+            count = page_size
+            if limit > 0:
+                count = min(count, limit - sent) if count > 0 else limit - sent
+
+            page = MayaUtil.Execute(self.__page, *(nodes, revision, count))
+            if page is None:
+                self.warn("Nodes were added or removed while listing, the result is incomplete")
+                break
+
+            for n in page:
+                out.send(n)
+
+            sent += len(page)
+            if count <= 0 or len(page) < count or sent == limit:
+                break
+
+    def __options(self):
+        try:
+            option_str = self.param("optionDict").get()
+            if option_str:
+                option_dict = eval(option_str)
+                if isinstance(option_dict, dict):
+                    return option_dict
+        except:
+            pass
+
+        return None
+
     def run(self):
+        static = MayaSceneMemo.IsStatic(self.__options() or {}, MayaSceneMemo.StaticLsFlags)
+        MayaSceneMemo.Run(self, [], ["result"], ["pattern", "type", "optionDict", "limit", "useApi"], self.__process, static)
+
+    def __process(self):
         nodes = []
         args = tuple()
         kwargs = {}
@@ -130,16 +2240,19 @@ class MayaPyLs(block.Block):
         if node_type:
             kwargs["type"] = node_type
 
-        try:
-            option_str = self.param("optionDict").get()
-            if option_str:
-                option_dict = eval(option_str)
-                if isinstance(option_dict, dict):
-                    kwargs.update(option_dict)
-        except:
-            pass
+        option_dict = self.__options()
+        if option_dict:
+            kwargs.update(option_dict)
+
+        if self.param("useApi").get() and not option_dict:
+            self.__runApi(pattern, node_type)
+            return
 
-        nodes = mayaExts.ExecuteFunction(self.__run, *args, **kwargs)
+        nodes = MayaUtil.Execute(self.__run, *args, **kwargs) or []
+
+        limit = self.param("limit").get()
+        if limit > 0:
+            nodes = nodes[:limit]
 
         out = self.output("result")
         for n in nodes:
@@ -153,37 +2266,65 @@ class MayaPyExist(block.Block):
     def initialize(self):
         self.addInput(str, "name")
         self.addOutput(bool, "exist")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         results = []
+        exists = {}
+
         for name in args[0]:
-            a = cmds.objExists(name)
+            a = exists.get(name)
+            if a is None:
+                a = cmds.objExists(name)
+                exists[name] = a
+
             results.append(a)
 
         return results
 
-    def run(self):
-        names = []
+    def __runApi(self, *args, **kwargs):
+        results = []
+        exists = {}
+        sel = om.MSelectionList()
 
-        inp = self.input("name")
+        for name in args[0]:
+            a = exists.get(name)
+            if a is None:
+                a = self.__existsApi(sel, name)
+                exists[name] = a
 
-        while (True):
-            name_p = inp.receive()
-            if name_p.isEOP():
-                break
+            results.append(a)
 
-            name = name_p.value()
-            name_p.drop()
+        return results
 
-            names.append(name)
+    def __existsApi(self, sel, name):
+        if MayaUtil.WildcardPattern.search(name):
+            return cmds.objExists(name)
 
-        results = []
+        try:
+            sel.clear()
+            sel.add(name)
+        except:
+            return cmds.objExists(name)
+
+        return True
+
+    def run(self):
+        MayaSceneMemo.Run(self, ["name"], ["exist"], ["useApi"], self.__process)
+
+    def __process(self):
+        inp = self.input("name")
         oup = self.output("exist")
 
-        results = mayaExts.ExecuteFunction(self.__run, *(names,))
+        func = self.__runApi if self.param("useApi").get() else self.__run
 
-        for r in results:
-            oup.send(r)
+        for names in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            results = MayaUtil.Execute(func, *(names,))
+
+            for r in results:
+                oup.send(r)
 
 
 class MayaPyListAttr(block.Block):
@@ -196,28 +2337,57 @@ class MayaPyListAttr(block.Block):
         self.addParam(bool, "keyable")
         self.addParam(bool, "userDefined")
         self.addParam(str, "optionDict")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useCache", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         results = []
         for obj in args[0]:
-            results += map(lambda x: "{}.{}".format(obj, x), cmds.listAttr(obj, **kwargs) or [])
+            prefix = obj + "."
+            results.extend([prefix + x for x in cmds.listAttr(obj, **kwargs) or []])
 
         return results
 
-    def run(self):
-        objs = []
-        inp = self.input("object")
+    def __runCached(self, *args, **kwargs):
+        MayaUtil.InstallCacheCallbacks()
 
-        while (True):
-            obj_p = inp.receive()
-            if obj_p.isEOP():
-                break
+        results = []
+        flags = repr(sorted(kwargs.items()))
+        sel = om.MSelectionList()
+
+        for obj in args[0]:
+            prefix = obj + "."
+            if "." in obj:
+                results.extend([prefix + x for x in cmds.listAttr(obj, **kwargs) or []])
+                continue
 
-            obj = obj_p.value()
+            try:
+                sel.clear()
+                sel.add(obj)
+                fn = om.MFnDependencyNode(sel.getDependNode(0))
+                node_type = fn.typeName
+                has_dynamic = fn.attributeCount() != MayaUtil.StaticAttrCount(node_type)
+            except:
+                node_type = cmds.nodeType(obj)
+                has_dynamic = True
+
+            key = (node_type, flags)
+            dynamic_attrs = []
+            if has_dynamic:
+                dynamic_attrs = cmds.listAttr(obj, userDefined=True, **kwargs) or []
+            static_attrs = MayaUtil.StaticAttrLists.get(key)
+            if static_attrs is None:
+                dynamic_set = set(dynamic_attrs)
+                static_attrs = [x for x in cmds.listAttr(obj, **kwargs) or [] if x not in dynamic_set]
+                MayaUtil.StaticAttrLists[key] = static_attrs
+
+            results.extend([prefix + x for x in static_attrs])
+            results.extend([prefix + x for x in dynamic_attrs])
 
-            obj_p.drop()
-            objs.append(obj)
+        return results
 
+    def __kwargs(self):
         kwargs = {}
 
         kwargs["keyable"] = self.param("keyable").get()
@@ -231,9 +2401,25 @@ class MayaPyListAttr(block.Block):
         except:
             pass
 
+        return dict((k, v) for k, v in kwargs.items() if v is not False)
+
+    def run(self):
+        static = MayaSceneMemo.IsStatic(self.__kwargs(), MayaUtil.StaticListAttrFlags | set(["userDefined", "ud"]))
+        MayaSceneMemo.Run(self, ["object"], ["attr"], ["keyable", "userDefined", "optionDict", "useCache"], self.__process, static)
+
+    def __process(self):
+        kwargs = self.__kwargs()
+
+        func = self.__run
+        if self.param("useCache").get() and not [k for k in kwargs if k not in MayaUtil.StaticListAttrFlags]:
+            func = self.__runCached
+
+        inp = self.input("object")
         oup = self.output("attr")
-        for r in mayaExts.ExecuteFunction(self.__run, *(objs, ), **kwargs):
-            oup.send(r)
+
+        for objs in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            for r in MayaUtil.Execute(func, *(objs, ), **kwargs):
+                oup.send(r)
 
 
 class MayaPyGetAttrType(block.Block):
@@ -243,34 +2429,33 @@ class MayaPyGetAttrType(block.Block):
     def initialize(self):
         self.addInput(str, "attr")
         self.addOutput(str, "type")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useCache", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         types = []
 
         for attr in args[0]:
-            types.append(cmds.getAttr(attr, type=True))
+            if kwargs.get("useCache"):
+                types.append(MayaUtil.AttrType(attr))
+            else:
+                types.append(cmds.getAttr(attr, type=True))
 
         return types
 
     def run(self):
-        attrs = []
-        inp = self.input("attr")
-
-        while (True):
-            attr_p = inp.receive()
-            if attr_p.isEOP():
-                break
-
-            attr = attr_p.value()
-            attr_p.drop()
+        MayaSceneMemo.Run(self, ["attr"], ["type"], ["useCache"], self.__process)
 
-            attrs.append(attr)
+    def __process(self):
+        inp = self.input("attr")
+        oup = self.output("type")
 
-        types = mayaExts.ExecuteFunction(self.__run, *(attrs,))
+        for attrs in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            types = MayaUtil.Execute(self.__run, *(attrs,), useCache=self.param("useCache").get())
 
-        oup = self.output("type")
-        for t in types:
-            oup.send(t)
+            for t in types:
+                oup.send(t)
 
 
 class MayaPyAttrSelectorNumeric(block.Block):
@@ -281,13 +2466,19 @@ class MayaPyAttrSelectorNumeric(block.Block):
         self.addInput(str, "attr")
         self.addOutput(str, "numeric")
         self.addOutput(str, "other")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useCache", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         numrics = []
         others = []
 
         for attr in args[0]:
-            type_str = cmds.getAttr(attr, type=True)
+            if kwargs.get("useCache"):
+                type_str = MayaUtil.AttrType(attr)
+            else:
+                type_str = cmds.getAttr(attr, type=True)
 
             if not MayaUtil.IsNumeric(type_str):
                 others.append(attr)
@@ -298,29 +2489,21 @@ class MayaPyAttrSelectorNumeric(block.Block):
         return (numrics, others)
 
     def run(self):
-        attrs = []
-        inp = self.input("attr")
-
-        while (True):
-            attr_p = inp.receive()
-            if attr_p.isEOP():
-                break
-
-            attr = attr_p.value()
-            attr_p.drop()
-
-            attrs.append(attr)
-
-        numerics, others = mayaExts.ExecuteFunction(self.__run, *(attrs, ))
+        MayaSceneMemo.Run(self, ["attr"], ["numeric", "other"], ["useCache"], self.__process)
 
+    def __process(self):
+        inp = self.input("attr")
         out_num = self.output("numeric")
         out_other = self.output("other")
 
-        for n in numerics:
-            out_num.send(n)
+        for attrs in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            numerics, others = MayaUtil.Execute(self.__run, *(attrs, ), useCache=self.param("useCache").get())
 
-        for o in others:
-            out_other.send(o)
+            for n in numerics:
+                out_num.send(n)
+
+            for o in others:
+                out_other.send(o)
 
 
 class MayaPyAttrSelectorString(block.Block):
@@ -331,13 +2514,19 @@ class MayaPyAttrSelectorString(block.Block):
         self.addInput(str, "attr")
         self.addOutput(str, "string")
         self.addOutput(str, "other")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useCache", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         strings = []
         others = []
 
         for attr in args[0]:
-            type_str = cmds.getAttr(attr, type=True)
+            if kwargs.get("useCache"):
+                type_str = MayaUtil.AttrType(attr)
+            else:
+                type_str = cmds.getAttr(attr, type=True)
 
             if not MayaUtil.IsString(type_str):
                 others.append(attr)
@@ -348,29 +2537,21 @@ class MayaPyAttrSelectorString(block.Block):
         return (strings, others)
 
     def run(self):
-        attrs = []
-        inp = self.input("attr")
-
-        while (True):
-            attr_p = inp.receive()
-            if attr_p.isEOP():
-                break
-
-            attr = attr_p.value()
-            attr_p.drop()
-
-            attrs.append(attr)
-
-        strings, others = mayaExts.ExecuteFunction(self.__run, *(attrs, ))
+        MayaSceneMemo.Run(self, ["attr"], ["string", "other"], ["useCache"], self.__process)
 
+    def __process(self):
+        inp = self.input("attr")
         out_str = self.output("string")
         out_other = self.output("other")
 
-        for n in strings:
-            out_str.send(n)
+        for attrs in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            strings, others = MayaUtil.Execute(self.__run, *(attrs, ), useCache=self.param("useCache").get())
 
-        for o in others:
-            out_other.send(o)
+            for n in strings:
+                out_str.send(n)
+
+            for o in others:
+                out_other.send(o)
 
 
 class MayaPyGetAttrNumeric(block.Block):
@@ -380,6 +2561,10 @@ class MayaPyGetAttrNumeric(block.Block):
     def initialize(self):
         self.addInput(str, "attr")
         self.addOutput(float, "value")
+        self.addOutput(MayaDoubleArray, "values")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "packed", False)
 
     def __run(self, *args, **kwargs):
         values = []
@@ -394,27 +2579,180 @@ class MayaPyGetAttrNumeric(block.Block):
 
         return values
 
+    def __runApi(self, *args, **kwargs):
+        values = MayaDoubleArray()
+        sel = om.MSelectionList()
+
+        for attr in args[0]:
+            v = None
+
+            try:
+                sel.clear()
+                sel.add(attr)
+                v = MayaUtil.ReadNumericPlug(sel.getPlug(0))
+            except:
+                pass
+
+            if v is None:
+                v = cmds.getAttr(attr)
+                if not isinstance(v, Number):
+                    self.warn("Invalid type '{}'".format(type(v)))
+                    continue
+
+            values.append(v)
+
+        return values
+
     def run(self):
-        attrs = []
         inp = self.input("attr")
+        val = self.output("value")
+        buf = self.output("values")
+        packed = self.param("packed").get()
+        func = self.__runApi if self.param("useApi").get() else self.__run
 
-        while (True):
-            attr_p = inp.receive()
-            if attr_p.isEOP():
-                break
+        for attrs in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            values = MayaUtil.Execute(func, *(attrs, ))
 
-            attr = attr_p.value()
-            attr_p.drop()
+            if packed:
+                buf.send(MayaDoubleArray(values))
+                continue
 
-            attrs.append(attr)
+            for v in values:
+                if not val.send(v):
+                    val.send(0)
 
-        values = mayaExts.ExecuteFunction(self.__run, *(attrs, ))
 
-        val = self.output("value")
+class MayaPyFusedAttrQuery(block.Block):
+    def __init__(self):
+        super(MayaPyFusedAttrQuery, self).__init__()
+
+    def initialize(self):
+        self.addOutput(str, "node")
+        self.addOutput(str, "attr")
+        self.addOutput(str, "numeric")
+        self.addOutput(str, "other")
+        self.addOutput(float, "value")
+        self.addParam(str, "pattern")
+        self.addParam(str, "type")
+        self.addParam(str, "lsOptionDict")
+        self.addParam(bool, "keyable")
+        self.addParam(bool, "userDefined")
+        self.addParam(str, "attrOptionDict")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "useCache", False)
+
+    def __options(self, name):
+        try:
+            option_str = self.param(name).get()
+            if option_str:
+                option_dict = eval(option_str)
+                if isinstance(option_dict, dict):
+                    return option_dict
+        except:
+            pass
+
+        return {}
+
+    def __ls(self, *args, **kwargs):
+        return cmds.ls(*args, **kwargs) or []
+
+    def __query(self, *args, **kwargs):
+        nodes, use_api, use_cache = args
+        attrs = []
+        numerics = []
+        others = []
+        values = []
+        sel = om.MSelectionList()
+
+        for node in nodes:
+            fn = None
+            if use_api:
+                try:
+                    sel.clear()
+                    sel.add(node)
+                    fn = om.MFnDependencyNode(sel.getDependNode(0))
+                except:
+                    fn = None
+
+            prefix = node + "."
+            for a in cmds.listAttr(node, **kwargs) or []:
+                attr = prefix + a
+                attrs.append(attr)
+
+                type_str = MayaUtil.AttrType(attr) if use_cache else cmds.getAttr(attr, type=True)
+                if not MayaUtil.IsNumeric(type_str):
+                    others.append(attr)
+                    continue
+
+                numerics.append(attr)
+
+                v = None
+                if fn is not None:
+                    try:
+                        v = MayaUtil.ReadNumericPlug(fn.findPlug(a, False))
+                    except:
+                        v = None
+
+                if v is None:
+                    v = cmds.getAttr(attr)
+                    if not isinstance(v, Number):
+                        self.warn("Invalid type '{}'".format(type(v)))
+                        continue
+
+                values.append(v)
+
+        return (attrs, numerics, others, values)
+
+    def run(self):
+        args = tuple()
+        ls_kwargs = {}
+
+        pattern = self.param("pattern").get()
+        if pattern:
+            args = (pattern, )
+
+        node_type = self.param("type").get()
+        if node_type:
+            ls_kwargs["type"] = node_type
+
+        ls_kwargs.update(self.__options("lsOptionDict"))
+
+        attr_kwargs = {}
+        attr_kwargs["keyable"] = self.param("keyable").get()
+        attr_kwargs["userDefined"] = self.param("userDefined").get()
+        attr_kwargs.update(self.__options("attrOptionDict"))
+
+        nodes = MayaUtil.Execute(self.__ls, *args, **ls_kwargs)
+
+        out_node = self.output("node")
+        for n in nodes:
+            out_node.send(n)
+
+        out_attr = self.output("attr")
+        out_num = self.output("numeric")
+        out_other = self.output("other")
+        out_val = self.output("value")
+        chunk_size = self.param("chunkSize").get()
+        step = chunk_size if chunk_size > 0 else max(len(nodes), 1)
+        use_api = self.param("useApi").get()
+        use_cache = self.param("useCache").get()
+
+        for i in range(0, len(nodes), step):
+            attrs, numerics, others, values = MayaUtil.Execute(self.__query, *(nodes[i:i + step], use_api, use_cache), **attr_kwargs)
+
+            for a in attrs:
+                out_attr.send(a)
+
+            for n in numerics:
+                out_num.send(n)
+
+            for o in others:
+                out_other.send(o)
 
-        for v in values:
-            if not val.send(v):
-                val.send(0)
+            for v in values:
+                if not out_val.send(v):
+                    out_val.send(0)
 
 
 class MayaPyGetAttrString(block.Block):
@@ -424,6 +2762,7 @@ class MayaPyGetAttrString(block.Block):
     def initialize(self):
         self.addInput(str, "attr")
         self.addOutput(str, "value")
+        self.addParam(int, "chunkSize", 0)
 
     def __run(self, *args, **kwargs):
         values = []
@@ -442,52 +2781,131 @@ class MayaPyGetAttrString(block.Block):
         return values
 
     def run(self):
-        attrs = []
         inp = self.input("attr")
+        val = self.output("value")
+
+        for attrs in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            values = MayaUtil.Execute(self.__run, *(attrs, ))
+
+            for v in values:
+                if not val.send(v):
+                    val.send("")
+
+
+class MayaPySetAttrNumeric(block.Block):
+    def __init__(self):
+        super(MayaPySetAttrNumeric, self).__init__()
+
+    def initialize(self):
+        self.addInput(str, "attr")
+        self.addInput(float, "value")
+        self.addInput(MayaDoubleArray, "values")
+        self.addOutput(bool, "result")
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "packed", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
+
+    def __setAttr(self, attr, value):
+        try:
+            cmds.setAttr(attr, value)
+        except Exception as e:
+            self.warn(str(e))
+            return False
+
+        return True
+
+    def __run(self, *args, **kwargs):
+        results = []
+
+        for attr, value in args[0]:
+            results.append(self.__setAttr(attr, value))
+
+        return results
+
+    def __runApi(self, *args, **kwargs):
+        return MayaUtil.BatchModify(args[0], MayaUtil.QueueNumericPlugValue, self.__setAttr)
+
+    def __receive(self):
+        attr_vals = []
+
+        in_att = self.input("attr")
+        in_val = self.input("value")
 
         while (True):
-            attr_p = inp.receive()
+            attr_p = in_att.receive()
             if attr_p.isEOP():
                 break
 
             attr = attr_p.value()
             attr_p.drop()
 
-            attrs.append(attr)
+            value_p = in_val.receive()
+            if value_p.isEOP():
+                break
+
+            value = value_p.value()
+            value_p.drop()
 
-        values = mayaExts.ExecuteFunction(self.__run, *(attrs, ))
+            attr_vals.append((attr, value))
 
-        val = self.output("value")
+        return attr_vals
 
-        for v in values:
-            if not val.send(v):
-                val.send("")
+    def __receivePacked(self):
+        attrs = list(itertools.chain.from_iterable(MayaUtil.ReceiveChunks(self.input("attr"), 0)))
 
+        values = MayaDoubleArray()
+        for bufs in MayaUtil.ReceiveChunks(self.input("values"), 1):
+            values.extend(MayaDoubleArray(bufs[0]))
 
-class MayaPySetAttrNumeric(block.Block):
+        if len(attrs) != len(values):
+            self.warn("Mismatched number of attributes ({}) and values ({})".format(len(attrs), len(values)))
+
+        return list(zip(attrs, values))
+
+    def run(self):
+        attr_vals = self.__receivePacked() if self.param("packed").get() else self.__receive()
+
+        func = self.__runApi if MayaUtil.UseApi(self) else self.__run
+        results = MayaUtil.ExecuteWrite(self, func, *(attr_vals, ))
+
+        oup = self.output("result")
+        for r in results:
+            oup.send(r)
+
+
+class MayaPySetAttrString(block.Block):
     def __init__(self):
-        super(MayaPySetAttrNumeric, self).__init__()
+        super(MayaPySetAttrString, self).__init__()
 
     def initialize(self):
         self.addInput(str, "attr")
-        self.addInput(float, "value")
+        self.addInput(str, "value")
         self.addOutput(bool, "result")
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
 
-    def __run(self, *args, **kwargs):
-        results = []
+    def __setAttr(self, attr, value):
+        try:
+            cmds.setAttr(attr, value, type="string")
+        except Exception as e:
+            self.warn(str(e))
+            return False
 
-        for attr, value in args[0]:
-            res = True
-            try:
-                cmds.setAttr(attr, value)
-            except Exception as e:
-                self.warn(str(e))
-                res = False
+        return True
+
+    def __run(self, *args, **kwargs):
+        results = []
 
-            results.append(res)
+        for attr, value in args[0]:
+            results.append(self.__setAttr(attr, value))
 
         return results
 
+    def __runApi(self, *args, **kwargs):
+        return MayaUtil.BatchModify(args[0], MayaUtil.QueueStringPlugValue, self.__setAttr)
+
     def run(self):
         attr_vals = []
 
@@ -511,65 +2929,109 @@ class MayaPySetAttrNumeric(block.Block):
 
             attr_vals.append((attr, value))
 
-        results = mayaExts.ExecuteFunction(self.__run, *(attr_vals, ))
+        func = self.__runApi if MayaUtil.UseApi(self) else self.__run
+        results = MayaUtil.ExecuteWrite(self, func, *(attr_vals, ))
 
         oup = self.output("result")
         for r in results:
             oup.send(r)
 
 
-class MayaPySetAttrString(block.Block):
+class MayaPyGetMeshPoints(block.Block):
     def __init__(self):
-        super(MayaPySetAttrString, self).__init__()
+        super(MayaPyGetMeshPoints, self).__init__()
 
     def initialize(self):
-        self.addInput(str, "attr")
-        self.addInput(str, "value")
-        self.addOutput(bool, "result")
+        self.addInput(str, "mesh")
+        self.addOutput(MayaDoubleArray, "points")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "worldSpace", False)
 
     def __run(self, *args, **kwargs):
         results = []
+        space = MayaUtil.MeshSpace(args[1])
+
+        for mesh in args[0]:
+            fn = MayaUtil.MeshFn(mesh)
+            if fn is None:
+                self.warn("Failed to find mesh '{}'".format(mesh))
+                results.append(MayaDoubleArray())
+                continue
 
-        for attr, value in args[0]:
-            res = True
             try:
-                cmds.setAttr(attr, value, type="string")
+                points = fn.getPoints(space)
             except Exception as e:
                 self.warn(str(e))
-                res = False
+                results.append(MayaDoubleArray())
+                continue
 
-            results.append(res)
+            results.append(MayaDoubleArray(itertools.chain.from_iterable((p.x, p.y, p.z) for p in points)))
 
         return results
 
     def run(self):
-        attr_vals = []
+        inp = self.input("mesh")
+        oup = self.output("points")
+        world = self.param("worldSpace").get()
 
-        in_att = self.input("attr")
-        in_val = self.input("value")
+        for meshes in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            for points in MayaUtil.Execute(self.__run, *(meshes, world)):
+                oup.send(points)
 
-        while (True):
-            attr_p = in_att.receive()
-            if attr_p.isEOP():
-                break
 
-            attr = attr_p.value()
-            attr_p.drop()
+class MayaPySetMeshPoints(block.Block):
+    def __init__(self):
+        super(MayaPySetMeshPoints, self).__init__()
 
-            value_p = in_val.receive()
-            if value_p.isEOP():
-                break
+    def initialize(self):
+        self.addInput(str, "mesh")
+        self.addInput(MayaDoubleArray, "points")
+        self.addOutput(bool, "result")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "worldSpace", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
 
-            value = value_p.value()
-            value_p.drop()
+    def __run(self, *args, **kwargs):
+        results = []
+        space = MayaUtil.MeshSpace(args[1])
 
-            attr_vals.append((attr, value))
+        for mesh, values in args[0]:
+            fn = MayaUtil.MeshFn(mesh)
+            if fn is None:
+                self.warn("Failed to find mesh '{}'".format(mesh))
+                results.append(False)
+                continue
+
+            if len(values) != fn.numVertices * 3:
+                self.warn("Mismatched number of points for '{}' : expected {} values, got {}".format(mesh, fn.numVertices * 3, len(values)))
+                results.append(False)
+                continue
+
+            it = iter(values)
+            try:
+                fn.setPoints(om.MPointArray(list(zip(it, it, it))), space)
+            except Exception as e:
+                self.warn(str(e))
+                results.append(False)
+                continue
+
+            results.append(True)
 
-        results = mayaExts.ExecuteFunction(self.__run, *(attr_vals, ))
+        return results
 
+    def run(self):
+        in_msh = self.input("mesh")
+        in_pnt = self.input("points")
         oup = self.output("result")
-        for r in results:
-            oup.send(r)
+        world = self.param("worldSpace").get()
+
+        if self.param("bulkWrite").get() and not self.param("disableUndo").get():
+            self.warn("MFnMesh.setPoints is not recorded in the undo chunk of a bulk write")
+
+        for mesh_points in MayaUtil.ReceivePairChunks(in_msh, in_pnt, self.param("chunkSize").get()):
+            for r in MayaUtil.ExecuteWrite(self, self.__run, *(mesh_points, world)):
+                oup.send(r)
 
 
 class MayaPyConnectAttr(block.Block):
@@ -580,20 +3042,30 @@ class MayaPyConnectAttr(block.Block):
         self.addInput(str, "source")
         self.addInput(str, "destination")
         self.addOutput(bool, "result")
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
+
+    def __connect(self, src, dst):
+        try:
+            cmds.connectAttr(src, dst, force=True)
+        except Exception as e:
+            self.warn(str(e))
+            return False
+
+        return True
 
     def __run(self, *args, **kwargs):
         results = []
 
         for src, dst in args[0]:
-            try:
-                cmds.connectAttr(src, dst, force=True)
-                results.append(True)
-            except Exception as e:
-                self.warn(str(e))
-                results.append(False)
+            results.append(self.__connect(src, dst))
 
         return results
 
+    def __runApi(self, *args, **kwargs):
+        return MayaUtil.BatchModify(args[0], MayaUtil.QueueConnect, self.__connect)
+
     def run(self):
         src_dst_list = []
         in_src = self.input("source")
@@ -619,7 +3091,8 @@ class MayaPyConnectAttr(block.Block):
 
             src_dst_list.append((src, dst))
 
-        results = mayaExts.ExecuteFunction(self.__run, *(src_dst_list,))
+        func = self.__runApi if MayaUtil.UseApi(self) else self.__run
+        results = MayaUtil.ExecuteWrite(self, func, *(src_dst_list,))
 
         oup = self.output("result")
         for r in results:
@@ -634,20 +3107,30 @@ class MayaPyDisconnectAttr(block.Block):
         self.addInput(str, "source")
         self.addInput(str, "destination")
         self.addOutput(bool, "result")
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
+
+    def __disconnect(self, src, dst):
+        try:
+            cmds.disconnectAttr(src, dst)
+        except Exception as e:
+            self.warn(str(e))
+            return False
+
+        return True
 
     def __run(self, *args, **kwargs):
         results = []
 
         for src, dst in args[0]:
-            try:
-                cmds.disconnectAttr(src, dst)
-                results.append(True)
-            except Exception as e:
-                self.warn(str(e))
-                results.append(False)
+            results.append(self.__disconnect(src, dst))
 
         return results
 
+    def __runApi(self, *args, **kwargs):
+        return MayaUtil.BatchModify(args[0], MayaUtil.QueueDisconnect, self.__disconnect)
+
     def run(self):
         src_dst_list = []
         in_src = self.input("source")
@@ -673,7 +3156,8 @@ class MayaPyDisconnectAttr(block.Block):
 
             src_dst_list.append((src, dst))
 
-        results = mayaExts.ExecuteFunction(self.__run, *(src_dst_list,))
+        func = self.__runApi if MayaUtil.UseApi(self) else self.__run
+        results = MayaUtil.ExecuteWrite(self, func, *(src_dst_list,))
 
         oup = self.output("result")
         for r in results:
@@ -688,6 +3172,9 @@ class MayaPyIsConnected(block.Block):
         self.addInput(str, "source")
         self.addInput(str, "destination")
         self.addOutput(bool, "result")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useIndex", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         results = []
@@ -701,36 +3188,26 @@ class MayaPyIsConnected(block.Block):
 
         return results
 
-    def run(self):
-        src_dst_list = []
-        in_src = self.input("source")
-        in_dst = self.input("destination")
-
-        while (True):
-            src = None
-            dst = None
-
-            src_p = in_src.receive()
-            if src_p.isEOP():
-                break
+    def __runIndex(self, *args, **kwargs):
+        MayaSceneIndex.Ensure()
 
-            src = src_p.value()
-            src_p.drop()
+        return [MayaSceneIndex.IsConnected(src, dst) for src, dst in args[0]]
 
-            dst_p = in_dst.receive()
-            if dst_p.isEOP():
-                break
+    def run(self):
+        MayaSceneMemo.Run(self, ["source", "destination"], ["result"], ["useIndex"], self.__process)
 
-            dst = dst_p.value()
-            dst_p.drop()
+    def __process(self):
+        in_src = self.input("source")
+        in_dst = self.input("destination")
+        oup = self.output("result")
 
-            src_dst_list.append((src, dst))
+        func = self.__runIndex if self.param("useIndex").get() else self.__run
 
-        results = mayaExts.ExecuteFunction(self.__run, *(src_dst_list,))
+        for src_dst_list in MayaUtil.ReceivePairChunks(in_src, in_dst, self.param("chunkSize").get()):
+            results = MayaUtil.Execute(func, *(src_dst_list,))
 
-        oup = self.output("result")
-        for r in results:
-            oup.send(r)
+            for r in results:
+                oup.send(r)
 
 
 class MayaPyCreateNode(block.Block):
@@ -741,6 +3218,9 @@ class MayaPyCreateNode(block.Block):
         self.addInput(str, "name")
         self.addInput(str, "nodeType")
         self.addOutput(str, "node")
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
 
     def __run(self, *args, **kwargs):
         results = []
@@ -750,8 +3230,41 @@ class MayaPyCreateNode(block.Block):
 
         return results
 
+    def __runApi(self, *args, **kwargs):
+        results = []
+        dg_mod = om.MDGModifier()
+        dag_mod = om.MDagModifier()
+
+        for name, node_type in args[0]:
+            kind = MayaUtil.NodeTypeKind(node_type)
+            if kind == "dag":
+                results.append(cmds.createNode(node_type, n=name, s=True))
+                continue
+
+            mod = dag_mod if kind == "transform" else dg_mod
+            obj = mod.createNode(node_type)
+            if name:
+                mod.renameNode(obj, name)
+
+            results.append(om.MObjectHandle(obj))
+
+        dg_mod.doIt()
+        dag_mod.doIt()
+
+        for i, r in enumerate(results):
+            if not isinstance(r, om.MObjectHandle):
+                continue
+
+            obj = r.object()
+            if obj.hasFn(om.MFn.kDagNode):
+                results[i] = om.MDagPath.getAPathTo(obj).partialPathName()
+            else:
+                results[i] = om.MFnDependencyNode(obj).name()
+
+        return results
+
     def run(self):
-        all_types = cmds.allNodeTypes()
+        all_types = MayaUtil.NodeTypes()
         in_name = self.input("name")
         in_type = self.input("nodeType")
 
@@ -782,7 +3295,8 @@ class MayaPyCreateNode(block.Block):
             name_type_list.append((name_p.value(), node_type_dump))
             name_p.drop()
 
-        results = mayaExts.ExecuteFunction(self.__run, *(name_type_list,))
+        func = self.__runApi if MayaUtil.UseApi(self) else self.__run
+        results = MayaUtil.ExecuteWrite(self, func, *(name_type_list,))
 
         oup = self.output("node")
         for r in results:
@@ -795,9 +3309,94 @@ class MayaPyDelete(block.Block):
 
     def initialize(self):
         self.addInput(str, "node")
+        self.addOutput(bool, "result")
+        self.addParam(bool, "useApi", False)
+        self.addParam(bool, "bulkWrite", False)
+        self.addParam(bool, "disableUndo", False)
+
+    def __delete(self, node):
+        try:
+            cmds.delete(node)
+        except Exception as e:
+            self.warn(str(e))
+            return False
+
+        return True
 
     def __run(self, *args, **kwargs):
-        cmds.delete(args[0])
+        if not args[0]:
+            return []
+
+        try:
+            cmds.delete(args[0])
+            return [True] * len(args[0])
+        except:
+            pass
+
+        nodes = list(OrderedDict.fromkeys(args[0]))
+        paths = {}
+        for node in nodes:
+            if "." in node or MayaUtil.WildcardPattern.search(node):
+                continue
+
+            long_names = cmds.ls(node, long=True) or []
+            if len(long_names) == 1 and long_names[0].startswith("|"):
+                paths[long_names[0]] = node
+
+        owners = MayaUtil.DagOwners(paths)
+        deleted = {}
+        for node in nodes:
+            if node not in owners:
+                deleted[node] = self.__delete(node)
+
+        for node, owner in owners.items():
+            deleted[node] = deleted[owner]
+
+        return [deleted[node] for node in args[0]]
+
+    def __runApi(self, *args, **kwargs):
+        nodes = list(OrderedDict.fromkeys(args[0]))
+        objects = {}
+        paths = {}
+        sel = om.MSelectionList()
+
+        for node in nodes:
+            if "." in node or MayaUtil.WildcardPattern.search(node):
+                continue
+
+            try:
+                sel.clear()
+                sel.add(node)
+                if sel.length() != 1:
+                    continue
+
+                obj = sel.getDependNode(0)
+                objects[node] = obj
+                if obj.hasFn(om.MFn.kDagNode):
+                    paths[sel.getDagPath(0).fullPathName()] = node
+            except:
+                continue
+
+        owners = MayaUtil.DagOwners(paths)
+
+        def queue(mod, node):
+            obj = objects.get(node)
+            if obj is None:
+                return False
+
+            try:
+                mod.deleteNode(obj, False)
+            except TypeError:
+                mod.deleteNode(obj)
+
+            return True
+
+        targets = [node for node in nodes if node not in owners]
+        deleted = dict(zip(targets, MayaUtil.BatchModify([(node, ) for node in targets], queue, self.__delete, om.MDagModifier)))
+        for node, owner in owners.items():
+            deleted[node] = deleted[owner]
+
+        return [deleted[node] for node in args[0]]
 
     def run(self):
         nodes = []
@@ -811,7 +3410,12 @@ class MayaPyDelete(block.Block):
             nodes.append(node_p.value())
             node_p.drop()
 
-        mayaExts.ExecuteFunction(self.__run, *(nodes, ))
+        func = self.__runApi if MayaUtil.UseApi(self) else self.__run
+        results = MayaUtil.ExecuteWrite(self, func, *(nodes, ))
+
+        oup = self.output("result")
+        for r in results:
+            oup.send(r)
 
 
 class MayaPyListConnections(block.Block):
@@ -825,6 +3429,9 @@ class MayaPyListConnections(block.Block):
         self.addParam(str, "type")
         self.addOutput(str, "source")
         self.addOutput(str, "destination")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useIndex", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         results = []
@@ -856,7 +3463,23 @@ class MayaPyListConnections(block.Block):
 
         return results
 
+    def __runIndex(self, *args, **kwargs):
+        MayaSceneIndex.Ensure()
+
+        results = []
+        for name in args[0]:
+            conns = MayaSceneIndex.ListConnections(name, kwargs.get("source"), kwargs.get("destination"), kwargs.get("type"))
+            if conns is None:
+                conns = self.__run([name], **kwargs)
+
+            results += conns
+
+        return results
+
     def run(self):
+        MayaSceneMemo.Run(self, ["name"], ["source", "destination"], ["srcConnection", "dstConnection", "type", "useIndex"], self.__process)
+
+    def __process(self):
         options = {"connections": True, "plugs": True}
         options["source"] = self.param("srcConnection").get()
         options["destination"] = self.param("dstConnection").get()
@@ -864,24 +3487,17 @@ class MayaPyListConnections(block.Block):
         if type_name:
             options["type"] = type_name
 
-        names = []
         in_name = self.input("name")
-        while (True):
-            name_p = in_name.receive()
-            if name_p.isEOP():
-                break
-
-            names.append(name_p.value())
-            name_p.drop()
-
-        results = mayaExts.ExecuteFunction(self.__run, *(names, ), **options)
-
         out_src = self.output('source')
         out_dst = self.output('destination')
+        func = self.__runIndex if self.param("useIndex").get() else self.__run
+
+        for names in MayaUtil.ReceiveChunks(in_name, self.param("chunkSize").get()):
+            results = MayaUtil.Execute(func, *(names, ), **options)
 
-        for (src, dst) in results:
-            out_src.send(src)
-            out_dst.send(dst)
+            for (src, dst) in results:
+                out_src.send(src)
+                out_dst.send(dst)
 
 
 class MayaPyListChildren(block.Block):
@@ -892,6 +3508,9 @@ class MayaPyListChildren(block.Block):
         self.addInput(str, "name")
         self.addOutput(list, "children")
         self.addParam(bool, "fullPath")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useIndex", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         results = []
@@ -900,27 +3519,36 @@ class MayaPyListChildren(block.Block):
 
         return results
 
+    def __runIndex(self, *args, **kwargs):
+        MayaSceneIndex.Ensure()
+
+        results = []
+        for name in args[0]:
+            relatives = MayaSceneIndex.ListChildren(name, kwargs.get("fullPath"))
+            if relatives is None:
+                relatives = cmds.listRelatives(name, **kwargs) or []
+
+            results.append(relatives)
+
+        return results
+
     def run(self):
+        MayaSceneMemo.Run(self, ["name"], ["children"], ["fullPath", "useIndex"], self.__process)
+
+    def __process(self):
         options = {}
         options["fullPath"] = self.param("fullPath").get()
         options["children"] = True
 
-        names = []
         in_name = self.input("name")
-        while (True):
-            name_p = in_name.receive()
-            if name_p.isEOP():
-                break
-
-            names.append(name_p.value())
-            name_p.drop()
-
-        results = mayaExts.ExecuteFunction(self.__run, *(names, ), **options)
-
         out_chd = self.output('children')
+        func = self.__runIndex if self.param("useIndex").get() else self.__run
 
-        for children in results:
-            out_chd.send(children)
+        for names in MayaUtil.ReceiveChunks(in_name, self.param("chunkSize").get()):
+            results = MayaUtil.Execute(func, *(names, ), **options)
+
+            for children in results:
+                out_chd.send(children)
 
 
 class MayaPyListParents(block.Block):
@@ -931,6 +3559,9 @@ class MayaPyListParents(block.Block):
         self.addInput(str, "name")
         self.addOutput(list, "parents")
         self.addParam(bool, "fullPath")
+        self.addParam(int, "chunkSize", 0)
+        self.addParam(bool, "useIndex", False)
+        self.addParam(bool, "memoize", False)
 
     def __run(self, *args, **kwargs):
         results = []
@@ -939,23 +3570,236 @@ class MayaPyListParents(block.Block):
 
         return results
 
+    def __runIndex(self, *args, **kwargs):
+        MayaSceneIndex.Ensure()
+
+        results = []
+        for name in args[0]:
+            relatives = MayaSceneIndex.ListParents(name, kwargs.get("fullPath"))
+            if relatives is None:
+                relatives = cmds.listRelatives(name, **kwargs) or []
+
+            results.append(relatives)
+
+        return results
+
     def run(self):
+        MayaSceneMemo.Run(self, ["name"], ["parents"], ["fullPath", "useIndex"], self.__process)
+
+    def __process(self):
         options = {"fullPath": self.param("fullPath").get()}
         options["parent"] = True
 
-        names = []
         in_name = self.input("name")
-        while (True):
-            name_p = in_name.receive()
-            if name_p.isEOP():
-                break
+        out_prn = self.output('parents')
+        func = self.__runIndex if self.param("useIndex").get() else self.__run
 
-            names.append(name_p.value())
-            name_p.drop()
+        for names in MayaUtil.ReceiveChunks(in_name, self.param("chunkSize").get()):
+            results = MayaUtil.Execute(func, *(names, ), **options)
 
-        results = mayaExts.ExecuteFunction(self.__run, *(names, ), **options)
+            for parents in results:
+                out_prn.send(parents)
 
-        out_prn = self.output('parents')
 
-        for parents in results:
-            out_prn.send(parents)
+class MayaPyTraverseGraph(block.Block):
+    def __init__(self):
+        super(MayaPyTraverseGraph, self).__init__()
+
+    def initialize(self):
+        self.addInput(str, "root")
+        self.addOutput(str, "node")
+        self.addOutput(str, "source")
+        self.addOutput(str, "destination")
+        self.addParam(str, "direction", "upstream")
+        self.addParam(int, "depth", 0)
+        self.addParam(str, "type")
+        self.addParam(str, "level", "node")
+        self.addParam(bool, "includeRoot", False)
+        self.addParam(int, "chunkSize", 0)
+
+    def __matches(self, obj, types):
+        if not types:
+            return True
+
+        type_name = None
+        for t in types:
+            fn_type = MayaUtil.MFnTypes.get(t)
+            if fn_type is not None:
+                if obj.hasFn(getattr(om.MFn, fn_type)):
+                    return True
+
+                continue
+
+            if type_name is None:
+                type_name = om.MFnDependencyNode(obj).typeName
+
+            if type_name == t:
+                return True
+
+        return False
+
+    def __run(self, *args, **kwargs):
+        roots, upstream, depth, types, plug_level, include_root = args
+        nodes = []
+        edges = []
+        visited = set()
+        edge_set = set()
+        sel = om.MSelectionList()
+
+        direction = om.MItDependencyGraph.kUpstream if upstream else om.MItDependencyGraph.kDownstream
+        level = om.MItDependencyGraph.kPlugLevel if plug_level else om.MItDependencyGraph.kNodeLevel
+
+        for root in roots:
+            try:
+                sel.clear()
+                sel.add(root)
+                start = sel.getPlug(0) if "." in root else sel.getDependNode(0)
+                it = om.MItDependencyGraph(start, om.MFn.kInvalid, direction, om.MItDependencyGraph.kBreadthFirst, level)
+            except:
+                self.warn("Failed to find '{}'".format(root))
+                continue
+
+            while not it.isDone():
+                current = it.currentNode()
+                path = it.getNodePath()
+                hops = len(path) - 1
+
+                if hops > 0 or include_root:
+                    key = om.MObjectHandle(current).hashCode()
+                    if key not in visited:
+                        visited.add(key)
+                        if self.__matches(current, types):
+                            nodes.append(MayaSceneIndex.NodeName(current))
+
+                if hops > 0:
+                    edge = None
+                    if plug_level:
+                        this_plug = it.thisPlug()
+                        prev_plug = it.previousPlug()
+                        if not this_plug.isNull and not prev_plug.isNull:
+                            edge = (MayaSceneIndex.PlugName(this_plug), MayaSceneIndex.PlugName(prev_plug))
+                    else:
+                        edge = (MayaSceneIndex.NodeName(current), MayaSceneIndex.NodeName(path[hops - 1]))
+
+                    if edge is not None:
+                        if not upstream:
+                            edge = (edge[1], edge[0])
+
+                        if edge not in edge_set:
+                            edge_set.add(edge)
+                            edges.append(edge)
+
+                if depth > 0 and hops >= depth:
+                    it.prune()
+
+                it.next()
+
+        return (nodes, edges)
+
+    def run(self):
+        direction = self.param("direction").get()
+        if direction not in ("upstream", "downstream"):
+            self.warn("Invalid direction '{}'".format(direction))
+            return
+
+        level = self.param("level").get()
+        if level not in ("node", "plug"):
+            self.warn("Invalid level '{}'".format(level))
+            return
+
+        types = [t.strip() for t in (self.param("type").get() or "").split(",") if t.strip()]
+        options = (direction == "upstream", self.param("depth").get(), types, level == "plug", self.param("includeRoot").get())
+
+        inp = self.input("root")
+        out_node = self.output("node")
+        out_src = self.output("source")
+        out_dst = self.output("destination")
+
+        for roots in MayaUtil.ReceiveChunks(inp, self.param("chunkSize").get()):
+            nodes, edges = MayaUtil.Execute(self.__run, *((roots, ) + options))
+
+            for n in nodes:
+                out_node.send(n)
+
+            for src, dst in edges:
+                out_src.send(src)
+                out_dst.send(dst)
+
+
+class MayaPyAuditWriter(block.Block):
+    def __init__(self):
+        super(MayaPyAuditWriter, self).__init__()
+
+    def initialize(self):
+        self.addInput(str, "node")
+        self.addInput(str, "attr")
+        self.addInput(str, "type")
+        self.addInput(float, "value")
+        self.addOutput(str, "path")
+        self.addParam(str, "path", "")
+        self.addParam(int, "chunkSize", 10000)
+
+    def run(self):
+        path = self.param("path").get()
+        if not path:
+            self.warn("No path is given")
+            return
+
+        ports = [self.input("node"), self.input("attr"), self.input("type"), self.input("value")]
+        table = MayaAuditTable(path)
+        table.create()
+
+        try:
+            for rows in MayaUtil.ReceiveRowChunks(ports, self.param("chunkSize").get()):
+                table.write(rows)
+        except:
+            table.close()
+            raise
+
+        table.close(commit=True)
+
+        self.output("path").send(path)
+
+
+class MayaPyAuditReader(block.Block):
+    def __init__(self):
+        super(MayaPyAuditReader, self).__init__()
+
+    def initialize(self):
+        self.addOutput(str, "node")
+        self.addOutput(str, "attr")
+        self.addOutput(str, "type")
+        self.addOutput(float, "value")
+        self.addParam(str, "path", "")
+        self.addParam(int, "chunkSize", 10000)
+
+    def run(self):
+        table = MayaAuditTable(self.param("path").get())
+
+        try:
+            table.open()
+        except Exception as e:
+            self.warn("Failed to open audit table '{}' : {}".format(table.path(), e))
+            table.close()
+            return
+
+        outputs = [self.output("node"), self.output("attr"), self.output("type"), self.output("value")]
+
+        try:
+            for columns in table.read(self.param("chunkSize").get()):
+                for row in zip(*columns):
+                    for oup, v in zip(outputs, row):
+                        oup.send(v)
+        finally:
+            table.close()
+
+
+if os.environ.get("PBDCCPACKS_MAYAPY_COALESCE"):
+    try:
+        MayaDispatcher.Enable(float(os.environ["PBDCCPACKS_MAYAPY_COALESCE"]) / 1000.0)
+    except ValueError:
+        MayaDispatcher.Enable()
+
+if os.environ.get("PBDCCPACKS_MAYAPY_PROFILE"):
+    MayaProfiler.Enable()
+    atexit.register(MayaProfiler.Dump, os.environ["PBDCCPACKS_MAYAPY_PROFILE"])